@@ -0,0 +1,97 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+_DONE = object()
+
+
+class ChunkedStreamingResponse(StreamingHttpResponse):
+    """Streaming response that also streams under ASGI.
+
+    Django 5.0 serves a sync iterator to ASGI by collecting it into a list first, so the whole
+    body sits in memory before the first byte goes out. Here each chunk is pulled separately,
+    always on the same thread, which also keeps server-side cursors on their connection.
+    """
+
+    async def __aiter__(self):
+        parts = iter(self.streaming_content)
+        pull = sync_to_async(next, thread_sensitive=True)
+        while (part := await pull(parts, _DONE)) is not _DONE:
+            yield part
+
+
+def wants_stream(request):
+    return request.query_params.get("stream") in ("1", "true")
+
+
+def encode_json(data):
+    return json.dumps(
+        data,
+        cls=JSONEncoder,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(",", ":"),
+    )
+
+
+def iter_json_array(rows, to_representation, chunk_size=DEFAULT_CHUNK_SIZE):
+    yield b"["
+    buffer = []
+    separator = ""
+    for row in rows:
+        buffer.append(separator)
+        buffer.append(encode_json(to_representation(row)))
+        separator = ","
+        if len(buffer) >= chunk_size * 2:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+    yield b"]"
+
+
+def stream_queryset(queryset, serializer, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows = queryset.iterator(chunk_size=chunk_size)
+    return ChunkedStreamingResponse(
+        iter_json_array(rows, serializer.to_representation, chunk_size=chunk_size),
+        content_type="application/json",
+    )
+
+
+class _LineBuffer:
+    """File-like sink that hands back whatever ``csv.writer`` just wrote."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(header).encode("utf-8")
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_ndjson(objects, chunk_size=DEFAULT_CHUNK_SIZE):
+    buffer = []
+    for obj in objects:
+        buffer.append(encode_json(obj))
+        buffer.append("\n")
+        if len(buffer) >= chunk_size * 2:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
@@ -19,7 +19,7 @@ class TripMemberAdmin(admin.ModelAdmin):
 
 @admin.register(ItineraryItem)
 class ItineraryItemAdmin(admin.ModelAdmin):
-    list_display = ("trip", "title", "date", "sort_order", "created_by")
+    list_display = ("trip", "title", "date", "rank", "created_by")
     list_filter = ("date",)
     search_fields = ("title", "trip__title", "created_by__email")
 
@@ -0,0 +1,42 @@
+import heapq
+from itertools import groupby
+from operator import itemgetter
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _interval(row):
+    start = _seconds(row["start_time"])
+    if row["end_time"] is None:
+        # An item without an end occupies its start second.
+        return start, start + 1
+    end = _seconds(row["end_time"])
+    if end <= start:
+        # Ends after midnight (or is empty): count it as running to the end of its day.
+        end = max(DAY_SECONDS, start + 1)
+    return start, end
+
+
+def find_conflicts(rows):
+    """Return ``(date, first, second)`` for every pair of overlapping items on the same date.
+
+    ``rows`` are dicts with ``date``, ``start_time`` and ``end_time``, sorted by ``date`` then
+    ``start_time`` (the order ``trips_itinerary_trip_date_idx`` hands them back in). Each date is
+    swept once with a heap of the intervals still open, so the cost is O(n log n) plus one step
+    per conflict reported.
+    """
+    conflicts = []
+    for date, day_rows in groupby(rows, key=itemgetter("date")):
+        open_items = []
+        for order, row in enumerate(day_rows):
+            start, end = _interval(row)
+            while open_items and open_items[0][0] <= start:
+                heapq.heappop(open_items)
+            for _, _, other in sorted(open_items, key=itemgetter(1)):
+                conflicts.append((date, other, row))
+            heapq.heappush(open_items, (end, order, row))
+    return conflicts
@@ -82,13 +82,17 @@ class TripChatConsumer(AsyncJsonWebsocketConsumer):
                 try:
                     encryption_version = int(encryption_version)
                 except (TypeError, ValueError):
-                    await self._send_error("INVALID_MESSAGE", "encryption_version must be an integer.")
+                    await self._send_error(
+                        "INVALID_MESSAGE", "encryption_version must be an integer."
+                    )
                     return
         else:
             encryption_version = None
 
         client_id = content.get("client_id")
-        message, created = await self._create_message(text, encrypted_content, encryption_version, client_id)
+        message, created = await self._create_message(
+            text, encrypted_content, encryption_version, client_id
+        )
         from .serializers import ChatMessageSerializer
 
         payload = ChatMessageSerializer(message).data
@@ -141,16 +145,14 @@ class TripChatConsumer(AsyncJsonWebsocketConsumer):
 
     @database_sync_to_async
     def _is_member(self, user, trip):
-        from .models import TripMember, TripStatus
+        from .permissions import get_trip_member
 
-        return TripMember.objects.filter(
-            trip=trip,
-            user=user,
-            status=TripStatus.ACTIVE,
-        ).exists()
+        return get_trip_member(user, trip) is not None
 
     @database_sync_to_async
     def _create_message(self, text, encrypted_content, encryption_version, client_id):
+        from django.db import transaction
+
         from .models import ChatMessage
 
         if client_id:
@@ -166,13 +168,14 @@ class TripChatConsumer(AsyncJsonWebsocketConsumer):
             if existing:
                 return existing, False
 
-        message = ChatMessage.objects.create(
-            trip=self.trip,
-            sender=self.user,
-            content=text or "",
-            encrypted_content=encrypted_content or None,
-            encryption_version=encryption_version,
-            client_id=client_id,
-        )
+        with transaction.atomic():
+            message = ChatMessage.objects.create(
+                trip=self.trip,
+                sender=self.user,
+                content=text or "",
+                encrypted_content=encrypted_content or None,
+                encryption_version=encryption_version,
+                client_id=client_id,
+            )
         message = ChatMessage.objects.select_related("sender").get(id=message.id)
         return message, True
@@ -0,0 +1,106 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import ValidationError
+
+from .ledger import rebuild_balances
+from .models import Expense, ExpenseSplit, FxRate, TripEntity
+from .splits import allocate, currency_exponent, from_minor, integer_weights
+from .sync import record_changes
+
+_CACHE_KEY = "fx_rates"
+
+
+def _rates():
+    rates = cache.get(_CACHE_KEY)
+    if rates is None:
+        rates = {
+            (base, quote): rate
+            for base, quote, rate in FxRate.objects.values_list("base", "quote", "rate")
+        }
+        cache.set(_CACHE_KEY, rates, timeout=settings.FX_RATES_CACHE_TIMEOUT)
+    return rates
+
+
+def invalidate_rates():
+    cache.delete(_CACHE_KEY)
+
+
+def _direct_rate(rates, from_currency, to_currency):
+    if (from_currency, to_currency) in rates:
+        return rates[(from_currency, to_currency)]
+    if (to_currency, from_currency) in rates:
+        return 1 / rates[(to_currency, from_currency)]
+    return None
+
+
+def get_rate(from_currency, to_currency):
+    """Units of ``to_currency`` per unit of ``from_currency``.
+
+    Falls back to a cross rate through a currency both sides are quoted against.
+    """
+    if from_currency == to_currency:
+        return Decimal("1")
+    rates = _rates()
+    rate = _direct_rate(rates, from_currency, to_currency)
+    if rate is not None:
+        return rate
+    for via in sorted({currency for pair in rates for currency in pair}):
+        first = _direct_rate(rates, from_currency, via)
+        second = _direct_rate(rates, via, to_currency)
+        if first is not None and second is not None:
+            return first * second
+    raise ValidationError(f"No exchange rate for {from_currency} to {to_currency}.")
+
+
+def convert(amount, from_currency, to_currency):
+    if from_currency == to_currency:
+        return amount
+    rate = get_rate(from_currency, to_currency)
+    unit = Decimal(1).scaleb(-currency_exponent(to_currency))
+    return (amount * rate).quantize(unit, rounding=ROUND_HALF_UP)
+
+
+def convert_expense(expense, splits, base_currency):
+    """Set ``base_amount`` on an expense and its splits.
+
+    Split base amounts are allocated from the converted total in proportion to the split
+    amounts, so they always add up to the expense's base amount.
+    """
+    expense.base_amount = convert(expense.amount, expense.currency, base_currency)
+    exponent = currency_exponent(base_currency)
+    total = int(expense.base_amount.scaleb(exponent).to_integral_value())
+    shares = allocate(total, integer_weights([split.amount for split in splits]))
+    for split, units in zip(splits, shares, strict=True):
+        split.base_amount = from_minor(units, exponent)
+
+
+def reconvert_trip_expenses(trip):
+    """Recompute stored base amounts after the trip's base currency changed."""
+    expenses = list(Expense.objects.filter(trip=trip).prefetch_related("splits"))
+    splits = []
+    for expense in expenses:
+        expense_splits = list(expense.splits.all())
+        convert_expense(expense, expense_splits, trip.base_currency)
+        splits.extend(expense_splits)
+    Expense.objects.bulk_update(expenses, ["base_amount"], batch_size=500)
+    ExpenseSplit.objects.bulk_update(splits, ["base_amount"], batch_size=500)
+    rebuild_balances(trip.id)
+    record_changes(trip.id, TripEntity.EXPENSE, [expense.id for expense in expenses])
+
+
+def load_rates(rows):
+    """Upsert ``(base, quote, rate)`` rows into the rate table."""
+    rates = [
+        FxRate(base=base.upper(), quote=quote.upper(), rate=Decimal(rate))
+        for base, quote, rate in rows
+    ]
+    FxRate.objects.bulk_create(
+        rates,
+        update_conflicts=True,
+        unique_fields=["base", "quote"],
+        update_fields=["rate", "updated_at"],
+    )
+    invalidate_rates()
+    return len(rates)
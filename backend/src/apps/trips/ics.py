@@ -0,0 +1,96 @@
+"""RFC 5545 (iCalendar) rendering for trip itineraries."""
+
+from datetime import UTC, datetime
+
+from apps.common.streaming import DEFAULT_CHUNK_SIZE
+
+LINE_OCTETS = 75
+CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Smart Trip Planner//EN",
+    "CALSCALE:GREGORIAN",
+)
+# The columns iter_calendar expects, in order.
+EVENT_COLUMNS = (
+    "id",
+    "title",
+    "location",
+    "notes",
+    "date",
+    "start_time",
+    "end_time",
+    "updated_at",
+)
+
+
+def escape_text(value):
+    """Escape a TEXT property value (RFC 5545 section 3.3.11)."""
+    value = value.strip().replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return value.replace("\r\n", "\\n").replace("\r", "\\n").replace("\n", "\\n")
+
+
+def fold(line):
+    """Fold a content line into CRLF-terminated chunks of at most 75 octets.
+
+    Continuation lines start with a space, and UTF-8 sequences are never split.
+    """
+    data = line.encode("utf-8")
+    if len(data) <= LINE_OCTETS:
+        return data + b"\r\n"
+    chunks = []
+    start = 0
+    limit = LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Back off continuation bytes (0b10xxxxxx) so a character stays on one line.
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(data[start:end])
+        start = end
+        limit = LINE_OCTETS - 1
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+def _utc_stamp(value):
+    value = value.astimezone(UTC)
+    return (
+        f"{value.year:04d}{value.month:02d}{value.day:02d}"
+        f"T{value.hour:02d}{value.minute:02d}{value.second:02d}Z"
+    )
+
+
+def _event_lines(row, tz):
+    item_id, title, location, notes, date, start_time, end_time, updated_at = row
+    yield "BEGIN:VEVENT"
+    yield f"UID:{item_id}@smart-trip-planner"
+    # Stamped with the item's last change, so the body only changes when the itinerary does.
+    yield f"DTSTAMP:{_utc_stamp(updated_at)}"
+    if start_time or end_time:
+        start = datetime.combine(date, start_time or end_time, tzinfo=tz)
+        end = datetime.combine(date, end_time or start_time, tzinfo=tz)
+        yield f"DTSTART:{_utc_stamp(start)}"
+        yield f"DTEND:{_utc_stamp(end)}"
+    else:
+        yield f"DTSTART;VALUE=DATE:{date.year:04d}{date.month:02d}{date.day:02d}"
+    yield f"SUMMARY:{escape_text(title)}"
+    if location:
+        yield f"LOCATION:{escape_text(location)}"
+    if notes:
+        yield f"DESCRIPTION:{escape_text(notes)}"
+    yield "END:VEVENT"
+
+
+def iter_calendar(rows, tz, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the calendar as byte chunks; ``rows`` are tuples of :data:`EVENT_COLUMNS`.
+
+    Times are local to ``tz`` (a zoneinfo timezone) and written out in UTC.
+    """
+    buffer = [fold(line) for line in CALENDAR_HEADER]
+    for row in rows:
+        buffer.extend(fold(line) for line in _event_lines(row, tz))
+        if len(buffer) >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+    buffer.append(fold("END:VCALENDAR"))
+    yield b"".join(buffer)
@@ -0,0 +1,187 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Cast, Round
+
+from .models import Expense, ExpenseSplit, TripMemberBalance
+
+ZERO = Decimal("0.00")
+BALANCE_FIELDS = ("paid", "owed", "base_paid", "base_owed")
+
+
+def _empty():
+    return [ZERO] * len(BALANCE_FIELDS)
+
+
+def expense_deltas(expense, splits, sign=1, deltas=None):
+    """Accumulate ``(user_id, currency) -> [paid, owed, base_paid, base_owed]`` changes.
+
+    Pass ``sign=-1`` for the state being removed. Passing the same ``deltas`` for the old and the
+    new version of an expense nets them out, so an edit only touches the members it affects.
+    """
+    if deltas is None:
+        deltas = defaultdict(_empty)
+    paid = deltas[(expense.paid_by_id, expense.currency)]
+    paid[0] += sign * expense.amount
+    paid[2] += sign * expense.base_amount
+    for split in splits:
+        owed = deltas[(split.user_id, expense.currency)]
+        owed[1] += sign * split.amount
+        owed[3] += sign * split.base_amount
+    return deltas
+
+
+def apply_deltas(trip_id, deltas):
+    changes = sorted((key, value) for key, value in deltas.items() if any(value))
+    if not changes:
+        return
+    with transaction.atomic(savepoint=False):
+        TripMemberBalance.objects.bulk_create(
+            [
+                TripMemberBalance(trip_id=trip_id, user_id=user_id, currency=currency)
+                for (user_id, currency), _ in changes
+            ],
+            ignore_conflicts=True,
+        )
+        # Rows are updated in key order so concurrent writers lock them in the same order.
+        for (user_id, currency), values in changes:
+            TripMemberBalance.objects.filter(
+                trip_id=trip_id, user_id=user_id, currency=currency
+            ).update(
+                **{
+                    field: F(field) + value
+                    for field, value in zip(BALANCE_FIELDS, values, strict=True)
+                }
+            )
+
+
+def expected_balances(trip_id=None):
+    expenses = Expense.objects.all()
+    splits = ExpenseSplit.objects.all()
+    if trip_id is not None:
+        expenses = expenses.filter(trip_id=trip_id)
+        splits = splits.filter(expense__trip_id=trip_id)
+
+    balances = defaultdict(_empty)
+    paid_rows = expenses.values_list("trip_id", "paid_by_id", "currency").annotate(
+        total=Sum("amount"), base_total=Sum("base_amount")
+    )
+    for row_trip_id, user_id, currency, total, base_total in paid_rows.order_by():
+        row = balances[(row_trip_id, user_id, currency)]
+        row[0] += total
+        row[2] += base_total
+    owed_rows = splits.values_list("expense__trip_id", "user_id", "expense__currency").annotate(
+        total=Sum("amount"), base_total=Sum("base_amount")
+    )
+    for row_trip_id, user_id, currency, total, base_total in owed_rows.order_by():
+        row = balances[(row_trip_id, user_id, currency)]
+        row[1] += total
+        row[3] += base_total
+    return balances
+
+
+def verify_balances(trip_id=None):
+    """Return ``(key, expected, actual)`` for every ledger row that disagrees with the expenses."""
+    expected = expected_balances(trip_id)
+    rows = TripMemberBalance.objects.all()
+    if trip_id is not None:
+        rows = rows.filter(trip_id=trip_id)
+    actual = {
+        (row_trip_id, user_id, currency): list(values)
+        for row_trip_id, user_id, currency, *values in rows.values_list(
+            "trip_id", "user_id", "currency", *BALANCE_FIELDS
+        )
+    }
+
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        want = expected.get(key, _empty())
+        have = actual.get(key, _empty())
+        if want != have:
+            mismatches.append((key, want, have))
+    return mismatches
+
+
+def rebuild_balances(trip_id=None):
+    expected = expected_balances(trip_id)
+    with transaction.atomic():
+        rows = TripMemberBalance.objects.all()
+        if trip_id is not None:
+            rows = rows.filter(trip_id=trip_id)
+        rows.delete()
+        TripMemberBalance.objects.bulk_create(
+            [
+                TripMemberBalance(
+                    trip_id=row_trip_id,
+                    user_id=user_id,
+                    currency=currency,
+                    **dict(zip(BALANCE_FIELDS, values, strict=True)),
+                )
+                for (row_trip_id, user_id, currency), values in expected.items()
+            ],
+            batch_size=1000,
+        )
+    return len(expected)
+
+
+def _cents(field):
+    return Cast(Round(F(field) * 100), IntegerField())
+
+
+def _member_position(field, user_ids):
+    return Case(
+        *(When(**{field: user_id}, then=Value(index)) for index, user_id in enumerate(user_ids)),
+        output_field=IntegerField(),
+    )
+
+
+def balance_timeline(trip_id):
+    """Replay a trip's expenses in order and snapshot every member's net after each one.
+
+    Nets are kept in an integer array (minor units of the base currency) indexed by member
+    position. A single ordered scan over the splits, joined to their expense, hands back positions
+    and cents directly, so there is no per-row UUID or Decimal conversion and every row comes from
+    the same snapshot; a new ``expense_id`` marks the start of the next expense. Returns
+    ``(user_ids, points)`` where each point is ``(expense_id, created_at, nets)`` and ``nets`` is
+    aligned with ``user_ids``.
+    """
+    # Every payer and participant has a ledger row, so this is the full member axis.
+    user_ids = list(
+        TripMemberBalance.objects.filter(trip_id=trip_id)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    if not user_ids:
+        return [], []
+
+    rows = (
+        ExpenseSplit.objects.filter(expense__trip_id=trip_id)
+        .order_by("expense__created_at", "expense_id")
+        .annotate(
+            payer=_member_position("expense__paid_by_id", user_ids),
+            expense_cents=_cents("expense__base_amount"),
+            member=_member_position("user_id", user_ids),
+            cents=_cents("base_amount"),
+        )
+        .values_list(
+            "expense_id", "expense__created_at", "payer", "expense_cents", "member", "cents"
+        )
+        .iterator(chunk_size=5000)
+    )
+
+    nets = [0] * len(user_ids)
+    points = []
+    # Consecutive rows with the same expense_id are that expense's splits.
+    for (expense_id, created_at, payer, expense_cents), splits in groupby(
+        rows, key=itemgetter(0, 1, 2, 3)
+    ):
+        nets[payer] += expense_cents
+        for *_, member, share in splits:
+            nets[member] -= share
+        points.append((expense_id, created_at, nets.copy()))
+    return user_ids, points
@@ -0,0 +1,113 @@
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.trips.ledger import rebuild_balances
+from apps.trips.models import Expense, ExpenseSplit, Trip, TripMember, TripRole
+from apps.trips.settlements import settle, to_cents
+from apps.trips.views import _active_members, _expense_summary
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, timings
+
+
+def _describe(timings):
+    return (
+        f"min {min(timings) * 1000:.1f} ms, "
+        f"median {statistics.median(timings) * 1000:.1f} ms over {len(timings)} run(s)"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the expense summary and settle() on a generated trip. The data is created in a "
+        "transaction that is rolled back; nothing is asserted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=300)
+        parser.add_argument("--expenses", type=int, default=5000)
+        parser.add_argument(
+            "--participants", type=int, default=8, help="Members sharing each expense."
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            started = time.perf_counter()
+            trip = self._build_trip(rng, options)
+            self.stdout.write(f"Built the trip in {time.perf_counter() - started:.1f} s.")
+
+            summary, timings = _timed(
+                lambda: _expense_summary(trip, _active_members(trip)), options["repeat"]
+            )
+            self.stdout.write(f"_expense_summary: {_describe(timings)}")
+
+            balances = {row["user"]["id"]: to_cents(row["net"]) for row in summary}
+            transfers, timings = _timed(lambda: settle(balances), options["repeat"])
+            self.stdout.write(f"settle: {_describe(timings)}")
+            self.stdout.write(
+                f"{len(summary)} member(s), {len(transfers)} transfer(s) "
+                f"for {sum(1 for cents in balances.values() if cents)} non-zero balance(s)."
+            )
+            transaction.set_rollback(True)
+
+    def _build_trip(self, rng, options):
+        User = get_user_model()
+        run = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create(
+            [
+                User(email=f"bench-{run}-{index}@example.com", name=f"Member {index}")
+                for index in range(options["members"])
+            ]
+        )
+        trip = Trip.objects.create(title=f"Settlement benchmark {run}", created_by=users[0])
+        TripMember.objects.bulk_create(
+            [
+                TripMember(
+                    trip=trip, user=user, role=TripRole.OWNER if index == 0 else TripRole.EDITOR
+                )
+                for index, user in enumerate(users)
+            ]
+        )
+
+        participants = min(options["participants"], len(users))
+        expenses = []
+        splits = []
+        for index in range(options["expenses"]):
+            sharing = rng.sample(users, participants)
+            cents = rng.randint(participants * 100, 50000)
+            expense = Expense(
+                trip=trip,
+                title=f"Expense {index}",
+                amount=Decimal(cents) / 100,
+                base_amount=Decimal(cents) / 100,
+                currency=trip.base_currency,
+                paid_by=rng.choice(sharing),
+                created_by=users[0],
+            )
+            expenses.append(expense)
+            share, remainder = divmod(cents, participants)
+            for position, user in enumerate(sharing):
+                amount = Decimal(share + (1 if position < remainder else 0)) / 100
+                splits.append(
+                    ExpenseSplit(expense=expense, user=user, amount=amount, base_amount=amount)
+                )
+        Expense.objects.bulk_create(expenses, batch_size=1000)
+        ExpenseSplit.objects.bulk_create(splits, batch_size=5000)
+        rebuild_balances(trip.id)
+        return trip
@@ -0,0 +1,36 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.trips.fx import load_rates, reconvert_trip_expenses
+from apps.trips.models import Trip
+
+
+class Command(BaseCommand):
+    help = "Load exchange rates from a CSV file with base,quote,rate columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file; one unit of base is worth rate units of quote.")
+        parser.add_argument(
+            "--reconvert",
+            action="store_true",
+            help="Recompute stored base-currency amounts for every trip with expenses.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as handle:
+                rows = [(row["base"], row["quote"], row["rate"]) for row in csv.DictReader(handle)]
+        except (OSError, KeyError) as exc:
+            raise CommandError(f"Could not read rates: {exc}") from exc
+
+        count = load_rates(rows)
+        self.stdout.write(self.style.SUCCESS(f"Loaded {count} rate(s)."))
+
+        if options["reconvert"]:
+            trips = Trip.objects.filter(expenses__isnull=False).distinct()
+            for trip in trips.iterator():
+                with transaction.atomic():
+                    reconvert_trip_expenses(trip)
+            self.stdout.write(self.style.SUCCESS("Recomputed base amounts."))
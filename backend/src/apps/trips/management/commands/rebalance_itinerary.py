@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.db.models.functions import Length
+
+from apps.trips.models import ItineraryItem
+from apps.trips.ranking import REBALANCE_LENGTH, rebalance_ranks
+
+
+class Command(BaseCommand):
+    help = "Compact itinerary rank keys that have grown long from repeated moves."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--trip", help="Only process this trip id, whatever its key length.")
+
+    def handle(self, *args, **options):
+        if options["trip"]:
+            trip_ids = [options["trip"]]
+        else:
+            trip_ids = list(
+                ItineraryItem.objects.values_list("trip_id", flat=True)
+                .annotate(longest=Max(Length("rank")))
+                .filter(longest__gt=REBALANCE_LENGTH)
+                .order_by()
+            )
+        for trip_id in trip_ids:
+            count = rebalance_ranks(trip_id)
+            self.stdout.write(f"{trip_id}: {count} item(s)")
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {len(trip_ids)} trip(s)."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.trips.ledger import BALANCE_FIELDS, rebuild_balances, verify_balances
+
+
+def _describe(values):
+    return " ".join(f"{field}={value}" for field, value in zip(BALANCE_FIELDS, values, strict=True))
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-member expense balance ledger, or verify it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--trip", help="Only process this trip id.")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare the ledger with the expenses without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        trip_id = options["trip"]
+        if options["verify"]:
+            mismatches = verify_balances(trip_id)
+            for (row_trip_id, user_id, currency), expected, actual in mismatches:
+                self.stderr.write(
+                    f"{row_trip_id} {user_id} {currency}: "
+                    f"expected {_describe(expected)}, found {_describe(actual)}"
+                )
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} ledger row(s) out of sync.")
+            self.stdout.write(self.style.SUCCESS("Ledger is in sync."))
+            return
+
+        count = rebuild_balances(trip_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} ledger row(s)."))
@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, FilteredRelation, Q
+from django.http import Http404
+from rest_framework.exceptions import PermissionDenied
+
+from .models import TripMember, TripStatus
+
+_CACHE_PREFIX = "trip_member"
+_NOT_A_MEMBER = "-"
+_MEMO_ATTR = "_trip_member_memo"
+_MEMBER_FIELDS = ["id", "trip_id", "user_id", "role", "status"]
+_MEMBER_RELATION = "caller_membership"
+
+
+def _cache_key(user_id, trip_id):
+    return f"{_CACHE_PREFIX}:{user_id}:{trip_id}"
+
+
+def _get_memo(request):
+    if request is None:
+        return None
+    memo = getattr(request, _MEMO_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(request, _MEMO_ATTR, memo)
+    return memo
+
+
+def _build_member(user_id, trip_id, member_id, role):
+    return TripMember.from_db(
+        "default",
+        _MEMBER_FIELDS,
+        [member_id, trip_id, user_id, role, TripStatus.ACTIVE],
+    )
+
+
+def _stats_key(outcome):
+    return f"{_CACHE_PREFIX}:stats:{outcome}"
+
+
+def _count(outcome):
+    # Counters live in the shared cache so every worker adds to the same totals.
+    key = _stats_key(outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def membership_cache_stats():
+    """Return the shared cache's membership ``{"hit": n, "miss": n}`` counts."""
+    values = cache.get_many([_stats_key("hit"), _stats_key("miss")])
+    return {outcome: values.get(_stats_key(outcome), 0) for outcome in ("hit", "miss")}
+
+
+def membership_cache_hit_rate():
+    """Fraction of membership lookups answered by the shared cache, or ``None`` before any."""
+    stats = membership_cache_stats()
+    total = stats["hit"] + stats["miss"]
+    return stats["hit"] / total if total else None
+
+
+def _cached_member(user_id, trip_id):
+    """Return ``(found, member)`` from the shared cache without touching the database."""
+    cached = cache.get(_cache_key(user_id, trip_id))
+    _count("miss" if cached is None else "hit")
+    if cached is None:
+        return False, None
+    if cached == _NOT_A_MEMBER:
+        return True, None
+    return True, _build_member(user_id, trip_id, *cached)
+
+
+def _cache_member(user_id, trip_id, member):
+    value = (member.id, member.role) if member else _NOT_A_MEMBER
+    cache.set(_cache_key(user_id, trip_id), value, timeout=settings.TRIP_MEMBERSHIP_CACHE_TIMEOUT)
+
+
+def _load_member(user_id, trip_id):
+    found, member = _cached_member(user_id, trip_id)
+    if found:
+        return member
+
+    member = TripMember.objects.filter(
+        trip_id=trip_id,
+        user_id=user_id,
+        status=TripStatus.ACTIVE,
+    ).first()
+    _cache_member(user_id, trip_id, member)
+    return member
+
+
+def resolve_trip_member(user, trip, request=None):
+    if not user or not user.is_authenticated:
+        return None
+    trip_id = getattr(trip, "pk", trip)
+    memo = _get_memo(request)
+    memo_key = (str(user.pk), str(trip_id))
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    member = _load_member(user.pk, trip_id)
+    if memo is not None:
+        memo[memo_key] = member
+    return member
+
+
+def _known_member(user, trip_path, request, lookup):
+    # A trip looked up by its own key already names the trip, so a memoized or cached
+    # membership answers the check and the object can be read without the membership join.
+    trip_id = None if trip_path else lookup.get("pk", lookup.get("id"))
+    if trip_id is None:
+        return False, None
+    memo = _get_memo(request)
+    memo_key = (str(user.pk), str(trip_id))
+    if memo is not None and memo_key in memo:
+        return True, memo[memo_key]
+    found, member = _cached_member(user.pk, trip_id)
+    if found and memo is not None:
+        memo[memo_key] = member
+    return found, member
+
+
+def fetch_trip_object(user, queryset, trip_path="trip", request=None, **lookup):
+    """Load the object matching ``lookup`` and the caller's active membership of its trip.
+
+    The membership comes from the request memo or the shared cache when the trip id is known up
+    front; otherwise it is joined onto the object query and the result primes both.
+    """
+    found, member = _known_member(user, trip_path, request, lookup)
+    if found:
+        rows = list(queryset.filter(**lookup).order_by()[:1])
+        return (rows[0], member) if rows else (None, None)
+
+    relation = f"{trip_path}__memberships" if trip_path else "memberships"
+    queryset = queryset.annotate(
+        **{
+            _MEMBER_RELATION: FilteredRelation(
+                relation,
+                condition=Q(
+                    **{
+                        f"{relation}__user_id": user.pk,
+                        f"{relation}__status": TripStatus.ACTIVE,
+                    }
+                ),
+            )
+        }
+    ).annotate(
+        caller_member_id=F(f"{_MEMBER_RELATION}__id"),
+        caller_member_role=F(f"{_MEMBER_RELATION}__role"),
+    )
+    if trip_path:
+        queryset = queryset.select_related(trip_path)
+    rows = list(queryset.filter(**lookup).order_by()[:1])
+    if not rows:
+        return None, None
+
+    obj = rows[0]
+    trip_id = getattr(obj, f"{trip_path}_id") if trip_path else obj.pk
+    member = None
+    if obj.caller_member_id is not None:
+        member = _build_member(user.pk, trip_id, obj.caller_member_id, obj.caller_member_role)
+    _cache_member(user.pk, trip_id, member)
+    memo = _get_memo(request)
+    if memo is not None:
+        memo[(str(user.pk), str(trip_id))] = member
+    return obj, member
+
+
+def resolve_trip_object(user, queryset, trip_path="trip", request=None, **lookup):
+    obj, member = fetch_trip_object(user, queryset, trip_path, request=request, **lookup)
+    if obj is None:
+        raise Http404
+    if member is None:
+        raise PermissionDenied("Not a trip member.")
+    return obj, member
+
+
+def invalidate_trip_member(user_id, trip_id):
+    key = _cache_key(user_id, trip_id)
+    cache.delete(key)
+    # Drop it again once the change is committed: another request may have cached the old role
+    # from the still-committed row in between.
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0004_bonus_features"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tripmember",
+            name="last_read_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="trip",
+            index=models.Index(fields=["-created_at", "-id"], name="trips_trip_created_id_idx"),
+        ),
+    ]
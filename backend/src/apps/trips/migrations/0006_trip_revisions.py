@@ -0,0 +1,100 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+BACKFILL_SOURCES = (
+    ("member", "TripMember"),
+    ("itinerary", "ItineraryItem"),
+    ("expense", "Expense"),
+    ("poll", "Poll"),
+    ("chat", "ChatMessage"),
+)
+
+
+def backfill_changes(apps, schema_editor):
+    Trip = apps.get_model("trips", "Trip")
+    TripChange = apps.get_model("trips", "TripChange")
+    now = timezone.now()
+
+    Trip.objects.update(revision=1)
+    changes = [
+        TripChange(trip_id=trip_id, entity="trip", object_id=trip_id, revision=1, changed_at=now)
+        for trip_id in Trip.objects.values_list("id", flat=True).iterator()
+    ]
+    TripChange.objects.bulk_create(changes, batch_size=1000)
+    for entity, model_name in BACKFILL_SOURCES:
+        Model = apps.get_model("trips", model_name)
+        changes = [
+            TripChange(
+                trip_id=trip_id, entity=entity, object_id=object_id, revision=1, changed_at=now
+            )
+            for object_id, trip_id in Model.objects.values_list("id", "trip_id").iterator()
+        ]
+        TripChange.objects.bulk_create(changes, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0005_trip_listing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trip",
+            name="revision",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="TripChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[
+                            ("trip", "Trip"),
+                            ("member", "Member"),
+                            ("itinerary", "Itinerary item"),
+                            ("expense", "Expense"),
+                            ("poll", "Poll"),
+                            ("chat", "Chat message"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("revision", models.BigIntegerField()),
+                ("deleted", models.BooleanField(default=False)),
+                ("changed_at", models.DateTimeField()),
+                (
+                    "trip",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="changes",
+                        to="trips.trip",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["trip", "revision"], name="trips_change_trip_rev_idx"),
+                    models.Index(
+                        fields=["trip", "entity", "revision"], name="trips_change_trip_ent_rev_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="tripchange",
+            constraint=models.UniqueConstraint(
+                fields=("trip", "entity", "object_id"), name="unique_trip_change_object"
+            ),
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
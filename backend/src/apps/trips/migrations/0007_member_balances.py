@@ -0,0 +1,79 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_balances(apps, schema_editor):
+    Expense = apps.get_model("trips", "Expense")
+    ExpenseSplit = apps.get_model("trips", "ExpenseSplit")
+    TripMemberBalance = apps.get_model("trips", "TripMemberBalance")
+
+    balances = {}
+    paid_rows = Expense.objects.values_list("trip_id", "paid_by_id", "currency").annotate(
+        total=Sum("amount")
+    )
+    for trip_id, user_id, currency, total in paid_rows.order_by():
+        balances.setdefault((trip_id, user_id, currency), [0, 0])[0] += total
+    owed_rows = ExpenseSplit.objects.values_list(
+        "expense__trip_id", "user_id", "expense__currency"
+    ).annotate(total=Sum("amount"))
+    for trip_id, user_id, currency, total in owed_rows.order_by():
+        balances.setdefault((trip_id, user_id, currency), [0, 0])[1] += total
+
+    TripMemberBalance.objects.bulk_create(
+        [
+            TripMemberBalance(
+                trip_id=trip_id, user_id=user_id, currency=currency, paid=paid, owed=owed
+            )
+            for (trip_id, user_id, currency), (paid, owed) in balances.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0006_trip_revisions"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TripMemberBalance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3)),
+                ("paid", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("owed", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                (
+                    "trip",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balances",
+                        to="trips.trip",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="trip_balances",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="tripmemberbalance",
+            constraint=models.UniqueConstraint(
+                fields=("trip", "user", "currency"), name="unique_trip_member_balance"
+            ),
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
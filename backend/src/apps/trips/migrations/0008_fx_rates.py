@@ -0,0 +1,70 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_base_amounts(apps, schema_editor):
+    # Historic summaries treated every amount as one currency; keep those numbers until rates
+    # are loaded and `load_fx_rates --reconvert` recomputes them.
+    apps.get_model("trips", "Expense").objects.update(base_amount=F("amount"))
+    apps.get_model("trips", "ExpenseSplit").objects.update(base_amount=F("amount"))
+    apps.get_model("trips", "TripMemberBalance").objects.update(
+        base_paid=F("paid"), base_owed=F("owed")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0007_member_balances"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FxRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("base", models.CharField(max_length=3)),
+                ("quote", models.CharField(max_length=3)),
+                ("rate", models.DecimalField(decimal_places=8, max_digits=18)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="expense",
+            name="base_amount",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="expensesplit",
+            name="base_amount",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="trip",
+            name="base_currency",
+            field=models.CharField(default="USD", max_length=3),
+        ),
+        migrations.AddField(
+            model_name="tripmemberbalance",
+            name="base_owed",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name="tripmemberbalance",
+            name="base_paid",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddConstraint(
+            model_name="fxrate",
+            constraint=models.UniqueConstraint(
+                fields=("base", "quote"), name="unique_fx_rate_pair"
+            ),
+        ),
+        migrations.RunPython(backfill_base_amounts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0009_expense_filters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="expense",
+            name="category",
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import migrations, models
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _rank_for_position(position):
+    digits = []
+    for _ in range(6):
+        position, digit = divmod(position, len(DIGITS))
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)) + "i"
+
+
+def backfill_ranks(apps, schema_editor):
+    ItineraryItem = apps.get_model("trips", "ItineraryItem")
+
+    items = ItineraryItem.objects.order_by("trip_id", "sort_order", "created_at", "id").only(
+        "id", "trip_id", "sort_order"
+    )
+    updated = []
+    trip_id = None
+    for item in items.iterator(chunk_size=1000):
+        if item.trip_id != trip_id:
+            trip_id, position = item.trip_id, 0
+        # Ties in the old dense order are broken by creation time.
+        item.sort_order = position
+        item.rank = _rank_for_position(position)
+        updated.append(item)
+        position += 1
+    ItineraryItem.objects.bulk_update(updated, ["sort_order", "rank"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0010_expense_category"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="itineraryitem",
+            options={"ordering": ["rank"]},
+        ),
+        migrations.RemoveIndex(
+            model_name="itineraryitem",
+            name="trips_itinerary_trip_sort_idx",
+        ),
+        migrations.AddField(
+            model_name="itineraryitem",
+            name="rank",
+            field=models.CharField(default="", max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="itineraryitem",
+            index=models.Index(fields=["trip", "rank"], name="trips_itinerary_trip_rank_idx"),
+        ),
+    ]
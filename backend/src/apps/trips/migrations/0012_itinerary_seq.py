@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_seq(apps, schema_editor):
+    Trip = apps.get_model("trips", "Trip")
+    ItineraryItem = apps.get_model("trips", "ItineraryItem")
+
+    last_position = (
+        ItineraryItem.objects.filter(trip_id=OuterRef("pk"))
+        .values("trip_id")
+        .annotate(last=Max("sort_order"))
+        .values("last")
+    )
+    Trip.objects.update(itinerary_seq=Coalesce(Subquery(last_position) + 1, 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trips", "0011_itinerary_rank"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trip",
+            name="itinerary_seq",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_seq, migrations.RunPython.noop),
+    ]
@@ -12,7 +12,13 @@ class Trip(models.Model):
     destination = models.CharField(max_length=255, blank=True)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
-    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="created_trips")
+    base_currency = models.CharField(max_length=3, default="USD")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="created_trips"
+    )
+    revision = models.BigIntegerField(default=0, editable=False)
+    # Next itinerary position to hand out (see apps.trips.ranking.allocate_position).
+    itinerary_seq = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,11 +26,23 @@ class Trip(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["created_by"], name="trips_trip_created_by_idx"),
+            models.Index(fields=["-created_at", "-id"], name="trips_trip_created_id_idx"),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        # revision and itinerary_seq are only ever advanced in SQL (see apps.trips.sync and
+        # apps.trips.ranking); never write back a stale copy.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ("revision", "itinerary_seq")
+            ]
+        super().save(*args, **kwargs)
+
 
 class TripRole(models.TextChoices):
     OWNER = "owner", "Owner"
@@ -39,9 +57,12 @@ class TripStatus(models.TextChoices):
 class TripMember(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     trip = models.ForeignKey(Trip, on_delete=models.CASCADE, related_name="memberships")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="trip_memberships")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="trip_memberships"
+    )
     role = models.CharField(max_length=20, choices=TripRole.choices, default=TripRole.OWNER)
     status = models.CharField(max_length=20, choices=TripStatus.choices, default=TripStatus.ACTIVE)
+    last_read_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -104,6 +125,8 @@ class Expense(models.Model):
     title = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     currency = models.CharField(max_length=3, default="USD")
+    base_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    category = models.CharField(max_length=50, blank=True)
     paid_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -120,6 +143,12 @@ class Expense(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["trip", "created_at"], name="trips_expense_trip_created_idx"),
+            models.Index(
+                fields=["trip", "paid_by", "created_at"], name="trips_expense_trip_payer_idx"
+            ),
+            models.Index(
+                fields=["trip", "currency", "created_at"], name="trips_expense_trip_cur_idx"
+            ),
         ]
 
     def __str__(self) -> str:
@@ -135,6 +164,7 @@ class ExpenseSplit(models.Model):
         related_name="expense_splits",
     )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    base_amount = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -150,6 +180,52 @@ class ExpenseSplit(models.Model):
         return f"{self.expense_id} - {self.user_id}"
 
 
+class TripMemberBalance(models.Model):
+    """Running paid/owed totals per member and currency, kept in step with expense writes.
+
+    ``base_paid``/``base_owed`` hold the same totals converted to the trip's base currency.
+    """
+
+    trip = models.ForeignKey(Trip, on_delete=models.CASCADE, related_name="balances")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="trip_balances",
+    )
+    currency = models.CharField(max_length=3)
+    paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    owed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    base_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    base_owed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trip", "user", "currency"], name="unique_trip_member_balance"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.trip_id} - {self.user_id} {self.currency}"
+
+
+class FxRate(models.Model):
+    """One unit of ``base`` is worth ``rate`` units of ``quote``."""
+
+    base = models.CharField(max_length=3)
+    quote = models.CharField(max_length=3)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["base", "quote"], name="unique_fx_rate_pair"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.base}/{self.quote} {self.rate}"
+
+
 class ItineraryItem(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     trip = models.ForeignKey(Trip, on_delete=models.CASCADE, related_name="itinerary_items")
@@ -160,6 +236,8 @@ class ItineraryItem(models.Model):
     end_time = models.TimeField(null=True, blank=True)
     date = models.DateField(null=True, blank=True)
     sort_order = models.IntegerField()
+    # Lexicographic ordering key (see ranking.py); lists are ordered by it, not by sort_order.
+    rank = models.CharField(max_length=64)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -169,10 +247,10 @@ class ItineraryItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["sort_order"]
+        ordering = ["rank"]
         indexes = [
             models.Index(fields=["trip", "date"], name="trips_itinerary_trip_date_idx"),
-            models.Index(fields=["trip", "sort_order"], name="trips_itinerary_trip_sort_idx"),
+            models.Index(fields=["trip", "rank"], name="trips_itinerary_trip_rank_idx"),
         ]
 
     def __str__(self) -> str:
@@ -197,7 +275,9 @@ class TripInvite(models.Model):
         related_name="sent_trip_invites",
     )
     token_hash = models.CharField(max_length=128)
-    status = models.CharField(max_length=20, choices=InviteStatus.choices, default=InviteStatus.PENDING)
+    status = models.CharField(
+        max_length=20, choices=InviteStatus.choices, default=InviteStatus.PENDING
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
@@ -255,7 +335,9 @@ class Vote(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     poll = models.ForeignKey(Poll, on_delete=models.CASCADE, related_name="votes")
     option = models.ForeignKey(PollOption, on_delete=models.CASCADE, related_name="votes")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="poll_votes")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="poll_votes"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -268,3 +350,42 @@ class Vote(models.Model):
 
     def __str__(self) -> str:
         return f"{self.poll_id} -> {self.user_id}"
+
+
+class TripEntity(models.TextChoices):
+    TRIP = "trip", "Trip"
+    MEMBER = "member", "Member"
+    ITINERARY = "itinerary", "Itinerary item"
+    EXPENSE = "expense", "Expense"
+    POLL = "poll", "Poll"
+    CHAT = "chat", "Chat message"
+
+
+class TripChange(models.Model):
+    trip = models.ForeignKey(
+        Trip,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="changes",
+    )
+    entity = models.CharField(max_length=20, choices=TripEntity.choices)
+    object_id = models.UUIDField()
+    revision = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trip", "entity", "object_id"], name="unique_trip_change_object"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["trip", "revision"], name="trips_change_trip_rev_idx"),
+            models.Index(
+                fields=["trip", "entity", "revision"], name="trips_change_trip_ent_rev_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.trip_id} {self.entity}:{self.object_id} @{self.revision}"
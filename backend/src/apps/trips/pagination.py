@@ -0,0 +1,71 @@
+import base64
+import binascii
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 30
+    max_limit = 100
+    ordering_field = "created_at"
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.limit_query_param in params
+
+    def get_limit(self, request):
+        raw = request.query_params.get(self.limit_query_param)
+        if raw is None:
+            return self.default_limit
+        try:
+            limit = int(raw)
+        except ValueError:
+            raise ValidationError("limit must be an integer.") from None
+        if limit < 1:
+            raise ValidationError("limit must be positive.")
+        return min(limit, self.max_limit)
+
+    def encode_cursor(self, obj):
+        value = f"{getattr(obj, self.ordering_field).isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            position, pk = value.split("|", 1)
+            position = parse_datetime(position)
+            pk = uuid.UUID(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValidationError("Invalid cursor.") from None
+        if position is None:
+            raise ValidationError("Invalid cursor.")
+        return position, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        limit = self.get_limit(request)
+        field = self.ordering_field
+        queryset = queryset.order_by(f"-{field}", "-pk")
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            position, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f"{field}__lt": position}) | Q(**{field: position, "pk__lt": pk})
+            )
+
+        rows = list(queryset[: limit + 1])
+        self.next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit]
+
+    def get_paginated_response(self, data):
+        return Response({"results": data, "next": self.next_cursor})
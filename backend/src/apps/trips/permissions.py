@@ -1,16 +1,11 @@
 from rest_framework import permissions
 
-from .models import TripMember, TripRole, TripStatus
+from .membership import resolve_trip_member
+from .models import TripRole
 
 
-def get_trip_member(user, trip):
-    if not user or not user.is_authenticated:
-        return None
-    return TripMember.objects.filter(
-        trip=trip,
-        user=user,
-        status=TripStatus.ACTIVE,
-    ).first()
+def get_trip_member(user, trip, request=None):
+    return resolve_trip_member(user, trip, request=request)
 
 
 def is_owner(member):
@@ -23,7 +18,7 @@ def is_editor_or_owner(member):
 
 class TripPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        member = get_trip_member(request.user, obj)
+        member = get_trip_member(request.user, obj, request=request)
 
         if member is None:
             return False
@@ -42,7 +37,7 @@ class TripPermission(permissions.BasePermission):
 
 class TripMemberPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        member = get_trip_member(request.user, obj.trip)
+        member = get_trip_member(request.user, obj.trip_id, request=request)
         if member is None:
             return False
         if request.method in permissions.SAFE_METHODS:
@@ -52,12 +47,12 @@ class TripMemberPermission(permissions.BasePermission):
 
 class TripOwnerPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        member = get_trip_member(request.user, obj.trip)
+        member = get_trip_member(request.user, obj.trip_id, request=request)
         return is_owner(member)
 
     def has_permission(self, request, view):
         trip = getattr(view, "trip", None)
         if trip is None:
             return request.user and request.user.is_authenticated
-        member = get_trip_member(request.user, trip)
+        member = get_trip_member(request.user, trip, request=request)
         return is_owner(member)
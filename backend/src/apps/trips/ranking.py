@@ -0,0 +1,130 @@
+"""Lexicographic rank keys for ordering itinerary items.
+
+A key is a base-36 fraction written with ``0-9a-z`` digits: ``"i"`` is 0.5, ``"0i"`` is 0.05. Keys
+never end in ``0``, so there is always room to insert before any key and plain string comparison
+matches the numeric order. Moving an item only rewrites that item's key.
+"""
+
+from django.db import connection, transaction
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ItineraryItem, Trip, TripEntity
+from .sync import record_changes
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+POSITION_WIDTH = 6
+MAX_POSITION = BASE**POSITION_WIDTH - 1
+# Keys longer than this are folded back into evenly spaced position keys by rebalancing.
+REBALANCE_LENGTH = 24
+
+
+def rank_for_position(position):
+    """Fixed-width key for a dense integer position; ordered the same way as the integers."""
+    digits = []
+    for _ in range(POSITION_WIDTH):
+        position, digit = divmod(position, BASE)
+        digits.append(DIGITS[digit])
+    if position:
+        raise ValueError("Position does not fit in a rank key.")
+    # The trailing midpoint digit keeps the key from ending in 0 and leaves room after it.
+    return "".join(reversed(digits)) + DIGITS[BASE // 2]
+
+
+def _midpoint(low, high):
+    # ``low`` may be empty (zero) and ``high`` may be None (one); low < high.
+    if high is not None:
+        prefix = 0
+        while (low[prefix] if prefix < len(low) else "0") == high[prefix]:
+            prefix += 1
+        if prefix:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def key_between(low, high):
+    """Return a key strictly between ``low`` and ``high``; either bound may be None.
+
+    After the last item the key just extends ``low``, so it still sorts before the next position
+    key handed out by :func:`rank_for_position`.
+    """
+    if low is not None and high is not None and low >= high:
+        raise ValueError(f"Rank {low!r} is not below {high!r}.")
+    if high is None:
+        return (low or "") + DIGITS[BASE // 2]
+    return _midpoint(low or "", high)
+
+
+def allocate_position(trip_id):
+    """Hand out the trip's next itinerary position in a single statement.
+
+    The UPDATE ... RETURNING increments the per-trip counter under the trip's row lock, so
+    concurrent inserts each get their own position without scanning the itinerary.
+    """
+    qn = connection.ops.quote_name
+    seq = qn("itinerary_seq")
+    sql = (
+        f"UPDATE {qn(Trip._meta.db_table)} SET {seq} = {seq} + 1 "
+        f"WHERE {qn('id')} = %s RETURNING {seq}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [Trip._meta.pk.get_db_prep_value(trip_id, connection)])
+        row = cursor.fetchone()
+    if row is None:
+        raise Trip.DoesNotExist
+    return row[0] - 1
+
+
+def reserve_positions(trip_id, upto):
+    """Keep :func:`allocate_position` from handing out positions up to ``upto`` again."""
+    Trip.objects.filter(pk=trip_id).update(itinerary_seq=Greatest("itinerary_seq", upto + 1))
+
+
+def write_positions(trip_id, positions):
+    """Set ``sort_order`` and the matching rank for ``{item_id: position}`` in one UPDATE.
+
+    Items outside ``trip_id`` are left alone; returns the number of rows updated so callers can
+    tell whether every id belonged to the trip.
+    """
+    if not positions:
+        return 0
+    qn = connection.ops.quote_name
+    table = qn(ItineraryItem._meta.db_table)
+    pk = ItineraryItem._meta.pk
+    values = []
+    updated_at = ItineraryItem._meta.get_field("updated_at")
+    params = [updated_at.get_db_prep_value(timezone.now(), connection)]
+    for item_id, position in positions.items():
+        values.append("(%s, %s, %s)")
+        params += [pk.get_db_prep_value(item_id, connection), position, rank_for_position(position)]
+    params.append(pk.get_db_prep_value(trip_id, connection))
+    sql = (
+        f"UPDATE {table} SET {qn('sort_order')} = v.column2, {qn('rank')} = v.column3, "
+        f"{qn('updated_at')} = %s FROM (VALUES {', '.join(values)}) AS v "
+        f"WHERE {table}.{qn('id')} = v.column1 AND {table}.{qn('trip_id')} = %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def rebalance_ranks(trip_id):
+    """Rewrite a trip's itinerary as dense positions with short, evenly spaced keys."""
+    with transaction.atomic():
+        item_ids = list(
+            ItineraryItem.objects.select_for_update()
+            .filter(trip_id=trip_id)
+            .order_by("rank", "id")
+            .values_list("id", flat=True)
+        )
+        write_positions(trip_id, {item_id: position for position, item_id in enumerate(item_ids)})
+        record_changes(trip_id, TripEntity.ITINERARY, item_ids)
+    return len(item_ids)
@@ -12,6 +12,8 @@ from .models import (
     TripMember,
     TripRole,
 )
+from .ranking import MAX_POSITION
+from .splits import SPLIT_VALUE_FIELDS, SplitType
 
 
 class TripSerializer(serializers.ModelSerializer):
@@ -23,10 +25,33 @@ class TripSerializer(serializers.ModelSerializer):
             "destination",
             "start_date",
             "end_date",
+            "base_currency",
+            "revision",
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("id", "created_at", "updated_at")
+        read_only_fields = ("id", "revision", "created_at", "updated_at")
+
+    def validate_base_currency(self, value):
+        value = value.strip().upper()
+        if len(value) != 3 or not value.isalpha():
+            raise serializers.ValidationError("Use a three-letter currency code.")
+        return value
+
+
+class TripCountsSerializer(TripSerializer):
+    member_count = serializers.IntegerField(read_only=True)
+    itinerary_count = serializers.IntegerField(read_only=True)
+    expense_count = serializers.IntegerField(read_only=True)
+    unread_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TripSerializer.Meta):
+        fields = TripSerializer.Meta.fields + (
+            "member_count",
+            "itinerary_count",
+            "expense_count",
+            "unread_count",
+        )
 
 
 class ItineraryItemSerializer(serializers.ModelSerializer):
@@ -42,23 +67,39 @@ class ItineraryItemSerializer(serializers.ModelSerializer):
             "start_time",
             "end_time",
             "date",
-            "sort_order",
+            "rank",
             "created_by",
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("id", "sort_order", "created_by", "created_at", "updated_at")
+        read_only_fields = ("id", "rank", "created_by", "created_at", "updated_at")
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 class ItineraryReorderItemSerializer(serializers.Serializer):
     id = serializers.UUIDField()
-    sort_order = serializers.IntegerField(min_value=0)
+    sort_order = serializers.IntegerField(min_value=0, max_value=MAX_POSITION)
 
 
 class ItineraryReorderSerializer(serializers.Serializer):
     items = ItineraryReorderItemSerializer(many=True)
 
 
+class ItineraryMoveSerializer(serializers.Serializer):
+    after = serializers.UUIDField(required=False, allow_null=True)
+    before = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if not attrs.get("after") and not attrs.get("before"):
+            raise serializers.ValidationError("Pass `after` and/or `before`.")
+        return attrs
+
+
 class TripInviteSerializer(serializers.ModelSerializer):
     invited_by = serializers.UUIDField(source="invited_by_id", read_only=True)
 
@@ -160,7 +201,7 @@ class ExpenseSplitSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ExpenseSplit
-        fields = ("id", "user", "amount")
+        fields = ("id", "user", "amount", "base_amount")
         read_only_fields = fields
 
 
@@ -178,6 +219,8 @@ class ExpenseSerializer(serializers.ModelSerializer):
             "title",
             "amount",
             "currency",
+            "base_amount",
+            "category",
             "paid_by",
             "created_by",
             "splits",
@@ -186,31 +229,84 @@ class ExpenseSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class NormalizedExpenseSplitSerializer(serializers.ModelSerializer):
+    user = serializers.UUIDField(source="user_id", read_only=True)
+
+    class Meta:
+        model = ExpenseSplit
+        fields = ("id", "user", "amount", "base_amount")
+        read_only_fields = fields
+
+
+class NormalizedExpenseSerializer(serializers.ModelSerializer):
+    """Expense with bare user ids; the users themselves are side-loaded once per response."""
+
+    trip_id = serializers.UUIDField(read_only=True)
+    paid_by = serializers.UUIDField(source="paid_by_id", read_only=True)
+    created_by = serializers.UUIDField(source="created_by_id", read_only=True)
+    splits = NormalizedExpenseSplitSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Expense
+        fields = ExpenseSerializer.Meta.fields
+        read_only_fields = fields
+
+
 class ExpenseSplitInputSerializer(serializers.Serializer):
     user_id = serializers.UUIDField()
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    weight = serializers.DecimalField(max_digits=10, decimal_places=4, required=False)
+    percentage = serializers.DecimalField(max_digits=7, decimal_places=4, required=False)
+
+
+def _validate_split_type(attrs):
+    splits = attrs.get("splits")
+    split_type = attrs.get("split_type")
+    if split_type is None:
+        split_type = SplitType.EXACT if splits else SplitType.EQUAL
+    if split_type != SplitType.EQUAL:
+        if not splits:
+            raise serializers.ValidationError({"splits": f"Required for {split_type} splits."})
+        field = SPLIT_VALUE_FIELDS[split_type]
+        if any(field not in split for split in splits):
+            raise serializers.ValidationError(
+                {"splits": f"Each split needs `{field}` for {split_type} splits."}
+            )
+    if splits and len({split["user_id"] for split in splits}) != len(splits):
+        raise serializers.ValidationError({"splits": "Each participant can appear only once."})
+    attrs["split_type"] = split_type
+    return attrs
 
 
 class ExpenseCreateSerializer(serializers.Serializer):
     title = serializers.CharField()
     amount = serializers.DecimalField(max_digits=10, decimal_places=2)
     currency = serializers.CharField(max_length=3, required=False)
+    category = serializers.CharField(max_length=50, required=False, allow_blank=True)
     paid_by = serializers.UUIDField(required=False)
     participant_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    split_type = serializers.ChoiceField(choices=SplitType.choices, required=False)
     splits = ExpenseSplitInputSerializer(many=True, required=False)
 
+    def validate(self, attrs):
+        return _validate_split_type(attrs)
+
 
 class ExpenseUpdateSerializer(serializers.Serializer):
     title = serializers.CharField(required=False)
     amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
     currency = serializers.CharField(max_length=3, required=False)
+    category = serializers.CharField(max_length=50, required=False, allow_blank=True)
     paid_by = serializers.UUIDField(required=False)
     participant_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    split_type = serializers.ChoiceField(choices=SplitType.choices, required=False)
     splits = ExpenseSplitInputSerializer(many=True, required=False)
 
     def validate(self, attrs):
         if not attrs:
             raise serializers.ValidationError("No fields to update.")
+        if "splits" in attrs or "split_type" in attrs:
+            return _validate_split_type(attrs)
         return attrs
 
 
@@ -219,6 +315,38 @@ class ExpenseSummarySerializer(serializers.Serializer):
     paid = serializers.DecimalField(max_digits=10, decimal_places=2)
     owed = serializers.DecimalField(max_digits=10, decimal_places=2)
     net = serializers.DecimalField(max_digits=10, decimal_places=2)
+    currency = serializers.CharField()
+
+
+class TripRefSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    title = serializers.CharField()
+
+
+class MyTripBalanceSerializer(serializers.Serializer):
+    trip = TripRefSerializer()
+    paid = serializers.DecimalField(max_digits=12, decimal_places=2)
+    owed = serializers.DecimalField(max_digits=12, decimal_places=2)
+    net = serializers.DecimalField(max_digits=12, decimal_places=2)
+    currency = serializers.CharField()
+
+
+class CounterpartyBalanceSerializer(serializers.Serializer):
+    user = MemberUserSerializer()
+    net = serializers.DecimalField(max_digits=12, decimal_places=2)
+    currency = serializers.CharField()
+
+
+class MyBalancesSerializer(serializers.Serializer):
+    trips = MyTripBalanceSerializer(many=True)
+    counterparties = CounterpartyBalanceSerializer(many=True)
+
+
+class SettlementSerializer(serializers.Serializer):
+    from_user = MemberUserSerializer()
+    to_user = MemberUserSerializer()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    currency = serializers.CharField()
 
 
 class PollOptionSerializer(serializers.ModelSerializer):
@@ -250,8 +378,9 @@ class PollSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if request is None or not request.user.is_authenticated:
             return None
-        vote = next((vote for vote in getattr(obj, "user_votes", [])), None)
-        if vote is None:
+        if hasattr(obj, "user_votes"):
+            vote = next(iter(obj.user_votes), None)
+        else:
             vote = obj.votes.filter(user=request.user).first()
         return str(vote.option_id) if vote else None
 
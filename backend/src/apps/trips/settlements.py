@@ -0,0 +1,41 @@
+import heapq
+from decimal import Decimal
+
+CENT = Decimal("0.01")
+
+
+def to_cents(amount):
+    return int((amount / CENT).to_integral_value())
+
+
+def from_cents(cents):
+    return Decimal(cents) * CENT
+
+
+def settle(balances):
+    """Greedy creditor/debtor matching over net balances in integer cents.
+
+    ``balances`` maps a key (usually a user id) to its net in cents: positive means the member
+    is owed money, negative means they owe. Each step settles the largest debtor against the
+    largest creditor, so at least one of them is closed per transfer and the result has at most
+    ``len(balances) - 1`` transfers. Runs in O(n log n).
+
+    Returns ``(debtor, creditor, cents)`` tuples.
+    """
+    # Heap entries carry the key as a tie-breaker so results are deterministic.
+    creditors = [(-cents, str(key), key) for key, cents in balances.items() if cents > 0]
+    debtors = [(cents, str(key), key) for key, cents in balances.items() if cents < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, credit_order, creditor = heapq.heappop(creditors)
+        debt, debt_order, debtor = heapq.heappop(debtors)
+        cents = min(-credit, -debt)
+        transfers.append((debtor, creditor, cents))
+        if -credit > cents:
+            heapq.heappush(creditors, (credit + cents, credit_order, creditor))
+        if -debt > cents:
+            heapq.heappush(debtors, (debt + cents, debt_order, debtor))
+    return transfers
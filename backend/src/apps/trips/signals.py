@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .membership import invalidate_trip_member
+from .models import (
+    ChatMessage,
+    Expense,
+    ItineraryItem,
+    Poll,
+    Trip,
+    TripChange,
+    TripEntity,
+    TripMember,
+)
+from .sync import mark_trip_deleting, record_changes, unmark_trip_deleting
+
+# Child rows (splits, poll options, votes) are recorded against their parent by the views
+# that write them. Chat messages cannot be deleted through the API, so they keep fast deletes.
+TRACKED_MODELS = {
+    TripMember: TripEntity.MEMBER,
+    ItineraryItem: TripEntity.ITINERARY,
+    Expense: TripEntity.EXPENSE,
+    Poll: TripEntity.POLL,
+    ChatMessage: TripEntity.CHAT,
+}
+
+
+@receiver([post_save, post_delete], sender=TripMember)
+def invalidate_membership_cache(sender, instance, **kwargs):
+    invalidate_trip_member(instance.user_id, instance.trip_id)
+
+
+@receiver(post_save, sender=Trip)
+def record_trip_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(instance.pk, TripEntity.TRIP, [instance.pk])
+
+
+@receiver(pre_delete, sender=Trip)
+def start_trip_delete(sender, instance, **kwargs):
+    mark_trip_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=Trip)
+def finish_trip_delete(sender, instance, **kwargs):
+    unmark_trip_deleting(instance.pk)
+    TripChange.objects.filter(trip_id=instance.pk).delete()
+
+
+def record_child_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(instance.trip_id, TRACKED_MODELS[sender], [instance.pk])
+
+
+def record_child_deleted(sender, instance, **kwargs):
+    record_changes(instance.trip_id, TRACKED_MODELS[sender], [instance.pk], deleted=True)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(
+        record_child_saved, sender=model, dispatch_uid=f"trip_sync_save_{model.__name__}"
+    )
+    if model is not ChatMessage:
+        post_delete.connect(
+            record_child_deleted, sender=model, dispatch_uid=f"trip_sync_delete_{model.__name__}"
+        )
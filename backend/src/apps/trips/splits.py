@@ -0,0 +1,113 @@
+from decimal import Decimal
+
+from django.db import models
+from rest_framework.exceptions import ValidationError
+
+
+class SplitType(models.TextChoices):
+    EQUAL = "equal", "Equal"
+    WEIGHTED = "weighted", "Weighted"
+    PERCENTAGE = "percentage", "Percentage"
+    EXACT = "exact", "Exact"
+
+
+# The per-split input field each non-equal strategy reads.
+SPLIT_VALUE_FIELDS = {
+    SplitType.EXACT: "amount",
+    SplitType.WEIGHTED: "weight",
+    SplitType.PERCENTAGE: "percentage",
+}
+
+
+# ISO 4217 minor-unit exponents that differ from the default of 2. Three-decimal currencies are not
+# listed because the amount columns store two decimal places.
+ZERO_DECIMAL_CURRENCIES = {
+    "BIF", "CLP", "DJF", "GNF", "ISK", "JPY", "KMF", "KRW", "PYG",
+    "RWF", "UGX", "UYI", "VND", "VUV", "XAF", "XOF", "XPF",
+}  # fmt: skip
+DEFAULT_EXPONENT = 2
+
+
+def currency_exponent(currency):
+    return 0 if (currency or "").upper() in ZERO_DECIMAL_CURRENCIES else DEFAULT_EXPONENT
+
+
+def to_minor(amount, exponent):
+    """Convert a Decimal to integer minor units; amounts finer than the currency are rejected."""
+    scaled = amount.scaleb(exponent)
+    if scaled != scaled.to_integral_value():
+        raise ValidationError(f"Amount {amount} has more than {exponent} decimal places.")
+    return int(scaled)
+
+
+def from_minor(units, exponent):
+    return Decimal(units).scaleb(-exponent)
+
+
+def allocate(total, weights):
+    """Split integer ``total`` proportionally to integer ``weights`` (largest remainder method).
+
+    The parts always sum to exactly ``total``. Leftover units go to the largest fractional
+    remainders, ties broken by position, so the result is deterministic.
+    """
+    weight_sum = sum(weights)
+    if not weights:
+        return []
+    if weight_sum == 0:
+        weights = [1] * len(weights)
+        weight_sum = len(weights)
+    if weight_sum < 0:
+        weights = [-weight for weight in weights]
+        weight_sum = -weight_sum
+
+    parts = []
+    remainders = []
+    for index, weight in enumerate(weights):
+        part, remainder = divmod(total * weight, weight_sum)
+        parts.append(part)
+        remainders.append((-remainder, index))
+
+    leftover = total - sum(parts)
+    for _, index in sorted(remainders)[:leftover]:
+        parts[index] += 1
+    return parts
+
+
+def integer_weights(values):
+    """Scale Decimal weights to integers sharing one power of ten, so ratios are exact."""
+    places = max((-value.as_tuple().exponent for value in values), default=0)
+    places = max(places, 0)
+    return [int(value.scaleb(places)) for value in values]
+
+
+def split_amount(amount, currency, split_type, values=None, count=None):
+    """Return one Decimal share per participant, summing exactly to ``amount``.
+
+    ``values`` holds the per-participant weights, percentages or exact amounts, depending on
+    ``split_type``. Equal splits only need ``count``.
+    """
+    exponent = currency_exponent(currency)
+    total = to_minor(amount, exponent)
+
+    if split_type == SplitType.EQUAL:
+        if not count:
+            raise ValidationError("Participants required.")
+        shares = allocate(total, [1] * count)
+    elif split_type == SplitType.EXACT:
+        shares = [to_minor(value, exponent) for value in values]
+        if sum(shares) != total:
+            raise ValidationError("Split amounts must equal total amount.")
+    elif split_type in (SplitType.WEIGHTED, SplitType.PERCENTAGE):
+        if not values:
+            raise ValidationError("Participants required.")
+        if any(value < 0 for value in values):
+            raise ValidationError("Split weights cannot be negative.")
+        if split_type == SplitType.PERCENTAGE and sum(values) != 100:
+            raise ValidationError("Split percentages must add up to 100.")
+        if not any(values):
+            raise ValidationError("At least one split weight must be positive.")
+        shares = allocate(total, integer_weights(values))
+    else:
+        raise ValidationError(f"Unknown split type {split_type!r}.")
+
+    return [from_minor(share, exponent) for share in shares]
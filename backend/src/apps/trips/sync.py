@@ -0,0 +1,141 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .models import Trip, TripChange
+
+_state = threading.local()
+
+
+def _deleting_trips():
+    trips = getattr(_state, "deleting_trips", None)
+    if trips is None:
+        trips = set()
+        _state.deleting_trips = trips
+    return trips
+
+
+def mark_trip_deleting(trip_id):
+    _deleting_trips().add(trip_id)
+
+
+def unmark_trip_deleting(trip_id):
+    _deleting_trips().discard(trip_id)
+
+
+def is_trip_deleting(trip_id):
+    return trip_id in _deleting_trips()
+
+
+def _pending_changes():
+    return getattr(_state, "pending_changes", None)
+
+
+@contextmanager
+def deferred_changes():
+    """Queue :func:`record_changes` calls made inside the block and write them at its end.
+
+    Bumping the revision takes the trip row lock until the transaction commits, so a request
+    records its changes once its own work is done instead of at its first write. Nothing is
+    written if the surrounding transaction has been marked for rollback.
+    """
+    if _pending_changes() is not None:
+        yield
+        return
+    _state.pending_changes = pending = {}
+    try:
+        yield
+        connection = transaction.get_connection()
+        if not (connection.in_atomic_block and connection.get_rollback()):
+            for trip_id, changes in pending.items():
+                _write_changes(trip_id, changes)
+    finally:
+        _state.pending_changes = None
+
+
+def record_changes(trip_id, entity, object_ids, deleted=False):
+    object_ids = list(dict.fromkeys(object_ids))
+    if not object_ids or is_trip_deleting(trip_id):
+        return None
+
+    pending = _pending_changes()
+    if pending is not None:
+        changes = pending.setdefault(trip_id, {})
+        for object_id in object_ids:
+            changes[(entity, str(object_id))] = deleted
+        return None
+    return _write_changes(trip_id, {(entity, object_id): deleted for object_id in object_ids})
+
+
+def _write_changes(trip_id, changes):
+    # ``changes`` maps ``(entity, object_id)`` to the tombstone flag; all share one revision.
+    with transaction.atomic(savepoint=False):
+        # The UPDATE takes the trip row lock, so revisions commit in the order they are handed out.
+        if not Trip.objects.filter(pk=trip_id).update(revision=F("revision") + 1):
+            return None
+        revision = Trip.objects.filter(pk=trip_id).values_list("revision", flat=True).get()
+        now = timezone.now()
+        TripChange.objects.bulk_create(
+            [
+                TripChange(
+                    trip_id=trip_id,
+                    entity=entity,
+                    object_id=object_id,
+                    revision=revision,
+                    deleted=deleted,
+                    changed_at=now,
+                )
+                for (entity, object_id), deleted in changes.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["trip", "entity", "object_id"],
+            update_fields=["revision", "deleted", "changed_at"],
+        )
+    return revision
+
+
+def changes_since(trip, since):
+    upserts = {}
+    deleted = {}
+    revision = trip.revision
+    rows = TripChange.objects.filter(trip=trip, revision__gt=since).values_list(
+        "entity", "object_id", "deleted", "revision"
+    )
+    for entity, object_id, is_deleted, row_revision in rows:
+        target = deleted if is_deleted else upserts
+        target.setdefault(entity, []).append(object_id)
+        revision = max(revision, row_revision)
+    return revision, upserts, deleted
+
+
+def collection_revision(trip_id, entities):
+    revision = (
+        TripChange.objects.filter(trip_id=trip_id, entity__in=entities)
+        .aggregate(revision=Max("revision"))
+        .get("revision")
+    )
+    return revision or 0
+
+
+def collection_etag(request, trip_id, entities, per_user=False):
+    parts = [
+        request.path,
+        request.META.get("QUERY_STRING", ""),
+        str(collection_revision(trip_id, entities)),
+    ]
+    if per_user:
+        parts.append(str(request.user.pk))
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
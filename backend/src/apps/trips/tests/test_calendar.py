@@ -0,0 +1,68 @@
+from datetime import UTC, date, datetime, time
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.trips.ics import escape_text, fold, iter_calendar
+
+
+def test_escape_and_fold():
+    value = "Dinner; wine, cheese\\n\nmore "
+    assert escape_text(value) == r"Dinner\; wine\, cheese\\n\nmore"
+    assert fold("SUMMARY:short") == b"SUMMARY:short\r\n"
+
+    line = "DESCRIPTION:" + "é" * 80
+    folded = fold(line)
+    physical = folded.split(b"\r\n")[:-1]
+    assert all(len(part) <= 75 for part in physical)
+    assert all(part.startswith(b" ") for part in physical[1:])
+    assert b"".join(part.removeprefix(b" ") for part in physical).decode("utf-8") == line
+
+
+def test_iter_calendar_writes_utc_and_all_day_events():
+    stamp = datetime(2026, 5, 1, 12, tzinfo=UTC)
+    rows = [
+        ("a", "Flight", "", "", date(2026, 6, 1), time(9, 30), time(11), stamp),
+        ("b", "Beach", "Nice, France", "", date(2026, 6, 2), None, None, stamp),
+    ]
+    body = b"".join(iter_calendar(rows, UTC)).decode("utf-8")
+    assert "DTSTART:20260601T093000Z\r\nDTEND:20260601T110000Z\r\n" in body
+    assert "DTSTART;VALUE=DATE:20260602\r\n" in body
+    assert "LOCATION:Nice\\, France\r\n" in body
+    assert "DTSTAMP:20260501T120000Z\r\n" in body
+    assert body.endswith("END:VCALENDAR\r\n")
+
+
+@pytest.mark.django_db
+def test_calendar_export_is_cached_and_conditional(
+    auth_client, api_client, user, django_assert_max_num_queries
+):
+    trip_id = auth_client.post("/api/trips", {"title": "Feed Trip"}, format="json").data["id"]
+    item = auth_client.post(
+        f"/api/trips/{trip_id}/itinerary",
+        {"title": "Museum, then lunch", "date": "2026-06-01", "start_time": "10:00"},
+        format="json",
+    ).data
+    url = f"/api/trips/{trip_id}/calendar?token={AccessToken.for_user(user)}"
+
+    resp = api_client.get(url)
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/calendar; charset=utf-8"
+    body = resp.content
+    assert b"SUMMARY:Museum\\, then lunch\r\n" in body
+    etag, last_modified = resp["ETag"], resp["Last-Modified"]
+
+    # Token check, membership, the revision probe and the cache hit; no itinerary scan.
+    with django_assert_max_num_queries(5) as captured:
+        cached = api_client.get(url)
+    assert cached.content == body
+    assert not any("trips_itineraryitem" in query["sql"] for query in captured.captured_queries)
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    auth_client.patch(f"/api/trips/{trip_id}/itinerary/{item['id']}", {"title": "Zoo"})
+    resp = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+    assert b"SUMMARY:Zoo\r\n" in resp.content
@@ -1,4 +1,6 @@
 import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from rest_framework.test import APIClient
 
 from apps.accounts.models import User
@@ -41,3 +43,23 @@ def test_chat_messages_list_requires_membership(auth_client, user):
     ok_resp = auth_client.get(f"/api/trips/{trip_id}/chat/messages")
     assert ok_resp.status_code == 200
     assert len(ok_resp.data) == 1
+
+
+@pytest.mark.django_db
+def test_chat_message_broadcast_after_commit(auth_client, django_capture_on_commit_callbacks):
+    trip_id = auth_client.post("/api/trips", {"title": "Chat Trip"}, format="json").data["id"]
+    layer = get_channel_layer()
+    channel = async_to_sync(layer.new_channel)()
+    async_to_sync(layer.group_add)(f"trip_{trip_id}", channel)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        resp = auth_client.post(
+            f"/api/trips/{trip_id}/chat/messages", {"content": "Hello"}, format="json"
+        )
+    assert resp.status_code == 201
+    assert len(callbacks) == 1
+
+    callbacks[0]()
+    event = async_to_sync(layer.receive)(channel)
+    assert event["type"] == "chat.message"
+    assert event["message"]["content"] == "Hello"
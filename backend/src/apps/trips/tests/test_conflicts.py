@@ -0,0 +1,29 @@
+from datetime import date, time
+
+from apps.trips.conflicts import find_conflicts
+
+
+def _row(name, day, start, end=None):
+    return {"id": name, "date": date(2026, 5, day), "start_time": start, "end_time": end}
+
+
+def test_find_conflicts_sweeps_each_day():
+    rows = [
+        _row("breakfast", 1, time(8), time(9)),
+        _row("museum", 1, time(8, 30), time(12)),
+        _row("call", 1, time(9)),
+        _row("lunch", 1, time(12), time(13)),
+        _row("club", 1, time(22), time(2)),
+        _row("taxi", 1, time(23, 30)),
+        _row("hike", 2, time(8), time(9)),
+    ]
+    pairs = [(first["id"], second["id"]) for _, first, second in find_conflicts(rows)]
+    # Touching intervals (breakfast/call, museum/lunch) do not clash; the club runs past midnight.
+    assert pairs == [("breakfast", "museum"), ("museum", "call"), ("club", "taxi")]
+
+
+def test_find_conflicts_flags_items_starting_together():
+    rows = [_row("a", 1, time(10)), _row("b", 1, time(10))]
+    assert [(first["id"], second["id"]) for _, first, second in find_conflicts(rows)] == [
+        ("a", "b")
+    ]
@@ -0,0 +1,53 @@
+import pytest
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.trips.models import ChatMessage
+
+
+@pytest.mark.django_db
+def test_dashboard_returns_all_sections(auth_client, user, django_assert_max_num_queries):
+    trip_id = auth_client.post("/api/trips", {"title": "Dash Trip"}, format="json").data["id"]
+    auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Check in"}, format="json")
+    auth_client.post(
+        f"/api/trips/{trip_id}/polls", {"question": "Dinner?", "options": ["A", "B"]}, format="json"
+    )
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses", {"title": "Hotel", "amount": "90.00"}, format="json"
+    )
+    for idx in range(3):
+        ChatMessage.objects.create(trip_id=trip_id, sender=user, content=f"msg {idx}")
+
+    # Up to 9 for the sections, plus the savepoint and release from ATOMIC_REQUESTS
+    with django_assert_max_num_queries(11):
+        resp = auth_client.get(f"/api/trips/{trip_id}/dashboard", {"chat_limit": 2})
+    assert resp.status_code == 200
+    assert resp.data["role"] == "owner"
+    assert resp.data["trip"]["title"] == "Dash Trip"
+    assert [item["title"] for item in resp.data["itinerary"]] == ["Check in"]
+    assert len(resp.data["members"]) == 1
+    assert resp.data["polls"][0]["question"] == "Dinner?"
+    assert resp.data["expense_summary"][0]["paid"] == "90.00"
+    assert [msg["content"] for msg in resp.data["chat"]] == ["msg 1", "msg 2"]
+
+
+@pytest.mark.django_db
+def test_dashboard_section_selection_and_membership(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "Dash Trip"}, format="json").data["id"]
+
+    resp = auth_client.get(
+        f"/api/trips/{trip_id}/dashboard", {"include": "trip,members,chat", "exclude": "chat"}
+    )
+    assert resp.status_code == 200
+    assert set(resp.data) == {"role", "trip", "members"}
+
+    assert (
+        auth_client.get(f"/api/trips/{trip_id}/dashboard", {"include": "nope"}).status_code == 400
+    )
+    resp = auth_client.get(f"/api/trips/{trip_id}/dashboard", {"chat_limit": -1})
+    assert resp.status_code == 400
+
+    outsider = User.objects.create_user(email="outsider@example.com", password="Password123!")
+    outsider_client = APIClient()
+    outsider_client.force_authenticate(user=outsider)
+    assert outsider_client.get(f"/api/trips/{trip_id}/dashboard").status_code == 403
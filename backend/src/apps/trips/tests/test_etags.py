@@ -0,0 +1,63 @@
+import pytest
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+
+
+@pytest.mark.django_db
+def test_itinerary_etag_short_circuits_until_collection_changes(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "ETag Trip"}, format="json").data["id"]
+    auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Check in"}, format="json")
+    url = f"/api/trips/{trip_id}/itinerary"
+
+    first = auth_client.get(url)
+    etag = first["ETag"]
+    assert first.status_code == 200
+    assert etag.startswith('"')
+
+    cached = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached["ETag"] == etag
+    assert not cached.content
+
+    auth_client.post(f"/api/trips/{trip_id}/polls", {"question": "Q", "options": ["A", "B"]})
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    auth_client.post(url, {"title": "Dinner"}, format="json")
+    changed = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+    assert len(changed.data) == 2
+
+
+@pytest.mark.django_db
+def test_poll_etag_is_per_user(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "ETag Trip"}, format="json").data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.VIEWER, status=TripStatus.ACTIVE
+    )
+    friend_client = APIClient()
+    friend_client.force_authenticate(user=friend)
+    url = f"/api/trips/{trip_id}/polls"
+
+    owner_etag = auth_client.get(url)["ETag"]
+    friend_resp = friend_client.get(url, HTTP_IF_NONE_MATCH=owner_etag)
+    assert friend_resp.status_code == 200
+    assert friend_resp["ETag"] != owner_etag
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["summary", "settlements", "timeline"])
+def test_expense_etags_change_with_base_currency(auth_client, path):
+    trip_id = auth_client.post("/api/trips", {"title": "ETag Trip"}, format="json").data["id"]
+    url = f"/api/trips/{trip_id}/expenses/{path}"
+    etag = auth_client.get(url)["ETag"]
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    resp = auth_client.patch(f"/api/trips/{trip_id}", {"base_currency": "EUR"}, format="json")
+    assert resp.status_code == 200
+    changed = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
@@ -0,0 +1,52 @@
+import pytest
+
+from apps.accounts.models import User
+from apps.trips.fx import load_rates
+from apps.trips.models import TripMember, TripRole, TripStatus
+
+
+@pytest.mark.django_db
+def test_expense_analytics_groups_and_caches(auth_client, user, django_assert_num_queries):
+    load_rates([("EUR", "USD", "1.10")])
+    trip_resp = auth_client.post("/api/trips", {"title": "Charts Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    for payload in [
+        {"title": "Hotel", "amount": "100.00", "category": "lodging"},
+        {"title": "Dinner", "amount": "20.00", "currency": "EUR", "category": "food"},
+        {"title": "Lunch", "amount": "15.00", "category": "food", "paid_by": str(friend.id)},
+    ]:
+        auth_client.post(f"/api/trips/{trip_id}/expenses", payload, format="json")
+
+    url = f"/api/trips/{trip_id}/expenses/analytics"
+    resp = auth_client.get(url)
+    assert resp.status_code == 200
+    data = resp.data
+    assert data["currency"] == "USD"
+    assert data["total"] == "137.00"
+    assert len(data["by_day"]) == 1
+    assert data["by_day"][0]["total"] == "137.00"
+    assert [(row["user"]["id"], row["total"]) for row in data["by_payer"]] == [
+        (str(user.id), "122.00"),
+        (str(friend.id), "15.00"),
+    ]
+    assert {row["currency"]: row["amount"] for row in data["by_currency"]} == {
+        "EUR": "20.00",
+        "USD": "115.00",
+    }
+    assert {row["category"]: row["total"] for row in data["by_category"]} == {
+        "food": "37.00",
+        "lodging": "100.00",
+    }
+
+    # savepoint + release, membership lookup and the revision probe; the aggregate is cached
+    with django_assert_num_queries(4):
+        assert auth_client.get(url).data == data
+
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses", {"title": "Taxi", "amount": "3.00"}, format="json"
+    )
+    assert auth_client.get(url).data["total"] == "140.00"
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import warnings
+
+import pytest
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+
+
+@pytest.mark.django_db
+def test_expense_export_csv_and_ndjson(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Export Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    participants = [str(user.id), str(friend.id)]
+    for title, amount in [("Hotel", "100.00"), ("Dinner, late", "45.50")]:
+        auth_client.post(
+            f"/api/trips/{trip_id}/expenses",
+            {"title": title, "amount": amount, "participant_ids": participants},
+            format="json",
+        )
+
+    resp = auth_client.get(f"/api/trips/{trip_id}/expenses/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.streaming
+    assert resp["Content-Type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(b"".join(resp.streaming_content).decode("utf-8"))))
+    assert len(rows) == 4
+    assert [row["title"] for row in rows] == ["Hotel", "Hotel", "Dinner, late", "Dinner, late"]
+    assert sorted(row["split_amount"] for row in rows[2:]) == ["22.75", "22.75"]
+    assert rows[0]["base_currency"] == "USD"
+
+    resp = auth_client.get(f"/api/trips/{trip_id}/expenses/export?format=ndjson")
+    assert resp.status_code == 200
+    lines = b"".join(resp.streaming_content).decode("utf-8").splitlines()
+    expenses = [json.loads(line) for line in lines]
+    assert [expense["title"] for expense in expenses] == ["Hotel", "Dinner, late"]
+    assert expenses[0]["amount"] == "100.00"
+    assert {split["user"]["email"] for split in expenses[0]["splits"]} == {
+        "user@example.com",
+        "friend@example.com",
+    }
+
+    assert auth_client.get(f"/api/trips/{trip_id}/expenses/export?format=xml").status_code == 400
+
+
+@pytest.mark.django_db
+def test_expense_export_streams_under_asgi(auth_client, asgi_get):
+    trip_id = auth_client.post("/api/trips", {"title": "ASGI Export"}, format="json").data["id"]
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses", {"title": "Taxi", "amount": "30.00"}, format="json"
+    )
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="StreamingHttpResponse must consume")
+        messages = asgi_get(f"/api/trips/{trip_id}/expenses/export", "format=csv")
+
+    assert messages[0]["status"] == 200
+    body = b"".join(message.get("body", b"") for message in messages[1:]).decode("utf-8")
+    assert [row["title"] for row in csv.DictReader(io.StringIO(body))] == ["Taxi"]
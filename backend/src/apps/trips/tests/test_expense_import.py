@@ -0,0 +1,83 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.accounts.models import User
+from apps.trips.ledger import verify_balances
+from apps.trips.models import Expense, TripChange, TripMember, TripRole, TripStatus
+
+
+@pytest.fixture
+def trip_with_friend(auth_client):
+    trip_resp = auth_client.post("/api/trips", {"title": "Import Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    return trip_id, friend
+
+
+@pytest.mark.django_db
+def test_bulk_import_json_is_all_or_nothing_unless_partial(
+    auth_client, user, trip_with_friend, django_assert_max_num_queries
+):
+    trip_id, friend = trip_with_friend
+    outsider = User.objects.create_user(email="outsider@example.com", password="Password123!")
+    rows = [
+        {"title": f"Row {index}", "amount": "12.00", "participant_ids": [str(friend.id)]}
+        for index in range(50)
+    ]
+    rows.append({"title": "Bad payer", "amount": "5.00", "paid_by": str(outsider.id)})
+    rows.append({"title": "No amount"})
+    url = f"/api/trips/{trip_id}/expenses/bulk"
+
+    resp = auth_client.post(url, rows, format="json")
+    assert resp.status_code == 400
+    assert [error["row"] for error in resp.data["errors"]] == [50, 51]
+    assert Expense.objects.filter(trip_id=trip_id).count() == 0
+
+    with django_assert_max_num_queries(16):
+        resp = auth_client.post(f"{url}?partial=1", {"expenses": rows}, format="json")
+    assert resp.status_code == 201
+    assert resp.data["created"] == 50
+    assert len(resp.data["errors"]) == 2
+    assert Expense.objects.filter(trip_id=trip_id).count() == 50
+    assert TripChange.objects.filter(trip_id=trip_id, entity="expense").count() == 50
+    assert verify_balances(trip_id) == []
+
+
+@pytest.mark.django_db
+def test_bulk_import_csv_upload(auth_client, user, trip_with_friend):
+    trip_id, friend = trip_with_friend
+    content = (
+        "title,amount,currency,paid_by,participant_ids,splits\n"
+        f"Hotel,100.00,USD,{friend.id},{user.id};{friend.id},\n"
+        f"Taxi,30.00,,,,{user.id}=10.00;{friend.id}=20.00\n"
+    )
+    upload = SimpleUploadedFile("expenses.csv", content.encode("utf-8"), content_type="text/csv")
+    resp = auth_client.post(
+        f"/api/trips/{trip_id}/expenses/bulk", {"file": upload}, format="multipart"
+    )
+    assert resp.status_code == 201
+    assert resp.data["created"] == 2
+
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    nets = {row["user"]["id"]: row["net"] for row in summary}
+    assert nets == {str(user.id): "-30.00", str(friend.id): "30.00"}
+
+
+@pytest.mark.django_db
+def test_bulk_import_rejects_unreadable_csv(auth_client, trip_with_friend):
+    trip_id, _ = trip_with_friend
+    url = f"/api/trips/{trip_id}/expenses/bulk"
+    latin1 = SimpleUploadedFile(
+        "expenses.csv", "title,amount\nCafé,4.50\n".encode("latin-1"), content_type="text/csv"
+    )
+    resp = auth_client.post(url, {"file": latin1}, format="multipart")
+    assert resp.status_code == 400
+    assert "UTF-8" in str(resp.data)
+
+    oversized = b'title,amount\n"' + b"x" * 200_000 + b'",3.00\n'
+    broken = SimpleUploadedFile("expenses.csv", oversized, content_type="text/csv")
+    assert auth_client.post(url, {"file": broken}, format="multipart").status_code == 400
+    assert not Expense.objects.filter(trip_id=trip_id).exists()
@@ -0,0 +1,44 @@
+import pytest
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+
+
+@pytest.mark.django_db
+def test_expense_timeline_replays_nets_in_order(auth_client, user, django_assert_max_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Timeline Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    expense_ids = []
+    for payload in [
+        {"title": "Hotel", "amount": "100.00"},
+        {"title": "Taxi", "amount": "10.00", "paid_by": str(friend.id)},
+        {"title": "Snacks", "amount": "5.00", "participant_ids": [str(friend.id)]},
+    ]:
+        resp = auth_client.post(f"/api/trips/{trip_id}/expenses", payload, format="json")
+        expense_ids.append(resp.data["id"])
+
+    url = f"/api/trips/{trip_id}/expenses/timeline"
+    with django_assert_max_num_queries(8):
+        resp = auth_client.get(url)
+    assert resp.status_code == 200
+    data = resp.data
+    assert data["currency"] == "USD"
+    positions = {member["id"]: index for index, member in enumerate(data["members"])}
+    assert positions.keys() == {str(user.id), str(friend.id)}
+
+    def nets(point):
+        return (point["nets"][positions[str(user.id)]], point["nets"][positions[str(friend.id)]])
+
+    assert [str(point["expense_id"]) for point in data["timeline"]] == expense_ids
+    assert [nets(point) for point in data["timeline"]] == [
+        ("50.00", "-50.00"),
+        ("45.00", "-45.00"),
+        ("50.00", "-50.00"),
+    ]
+
+    etag = resp["ETag"]
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
@@ -1,8 +1,11 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from apps.accounts.models import User
-from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.ledger import verify_balances
+from apps.trips.models import ExpenseSplit, TripMember, TripRole, TripStatus
 
 
 @pytest.mark.django_db
@@ -47,3 +50,136 @@ def test_expense_permissions_viewer_cannot_create(auth_client, user):
         format="json",
     )
     assert resp.status_code == 403
+
+
+@pytest.mark.django_db
+def test_expenses_normalized_shape_side_loads_users(auth_client, user, django_assert_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Normalized Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    for title in ["Hotel", "Dinner", "Taxi"]:
+        auth_client.post(
+            f"/api/trips/{trip_id}/expenses",
+            {"title": title, "amount": "30.00", "participant_ids": [str(user.id), str(friend.id)]},
+            format="json",
+        )
+
+    nested = auth_client.get(f"/api/trips/{trip_id}/expenses")
+    # savepoint + release, membership, etag revision, expenses, splits, users
+    with django_assert_num_queries(7):
+        resp = auth_client.get(f"/api/trips/{trip_id}/expenses?shape=normalized")
+    assert resp.status_code == 200
+    assert set(resp.data["users"]) == {str(user.id), str(friend.id)}
+    assert resp.data["users"][str(friend.id)]["email"] == "friend@example.com"
+
+    first = resp.data["expenses"][0]
+    assert first["id"] == nested.data[0]["id"]
+    assert first["paid_by"] == str(user.id)
+    assert {split["user"] for split in first["splits"]} == {str(user.id), str(friend.id)}
+
+
+@pytest.mark.django_db
+def test_expenses_keyset_pagination_and_filters(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Paged Expenses"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    for index in range(5):
+        auth_client.post(
+            f"/api/trips/{trip_id}/expenses",
+            {
+                "title": f"Expense {index}",
+                "amount": "10.00",
+                "paid_by": str(friend.id if index % 2 else user.id),
+                "participant_ids": [str(friend.id)] if index == 4 else [str(user.id)],
+            },
+            format="json",
+        )
+
+    titles = []
+    cursor = None
+    while True:
+        url = f"/api/trips/{trip_id}/expenses?limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        resp = auth_client.get(url)
+        assert resp.status_code == 200
+        titles.extend(expense["title"] for expense in resp.data["results"])
+        cursor = resp.data["next"]
+        if not cursor:
+            break
+    assert titles == [f"Expense {index}" for index in reversed(range(5))]
+
+    paid_by_friend = auth_client.get(f"/api/trips/{trip_id}/expenses?paid_by={friend.id}")
+    assert [expense["title"] for expense in paid_by_friend.data] == ["Expense 3", "Expense 1"]
+
+    friend_shares = auth_client.get(
+        f"/api/trips/{trip_id}/expenses?participant={friend.id}&shape=normalized&limit=10"
+    )
+    assert [expense["title"] for expense in friend_shares.data["results"]] == ["Expense 4"]
+    assert str(friend.id) in friend_shares.data["users"]
+
+    assert auth_client.get(f"/api/trips/{trip_id}/expenses?currency=eur").data == []
+    assert len(auth_client.get(f"/api/trips/{trip_id}/expenses?currency=usd").data) == 5
+    assert auth_client.get(f"/api/trips/{trip_id}/expenses?to=2000-01-01").data == []
+    assert len(auth_client.get(f"/api/trips/{trip_id}/expenses?from=2000-01-01").data) == 5
+    assert auth_client.get(f"/api/trips/{trip_id}/expenses?paid_by=nope").status_code == 400
+
+
+@pytest.mark.django_db
+def test_expense_patch_only_writes_changed_splits(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Diff Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friends = [
+        User.objects.create_user(email=f"friend{index}@example.com", password="Password123!")
+        for index in range(2)
+    ]
+    for friend in friends:
+        TripMember.objects.create(
+            trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+        )
+    expense_resp = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {
+            "title": "Hotel",
+            "amount": "90.00",
+            "participant_ids": [str(user.id), str(friends[0].id)],
+        },
+        format="json",
+    )
+    expense_id = expense_resp.data["id"]
+    kept_split = ExpenseSplit.objects.get(expense_id=expense_id, user=user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = auth_client.patch(f"/api/expenses/{expense_id}", {"title": "Hostel"}, format="json")
+    assert resp.status_code == 200
+    split_writes = [
+        query["sql"]
+        for query in ctx.captured_queries
+        if "trips_expensesplit" in query["sql"] and not query["sql"].startswith("SELECT")
+    ]
+    assert split_writes == []
+
+    resp = auth_client.patch(
+        f"/api/expenses/{expense_id}",
+        {"participant_ids": [str(user.id), str(friends[1].id)]},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert {split["user"]["id"] for split in resp.data["splits"]} == {
+        str(user.id),
+        str(friends[1].id),
+    }
+    assert ExpenseSplit.objects.get(expense_id=expense_id, user=user).id == kept_split.id
+    assert verify_balances(trip_id) == []
+
+    resp = auth_client.patch(f"/api/expenses/{expense_id}", {"amount": "100.00"}, format="json")
+    assert sorted(split["amount"] for split in resp.data["splits"]) == ["50.00", "50.00"]
+    assert verify_balances(trip_id) == []
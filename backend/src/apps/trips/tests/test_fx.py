@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from apps.trips.fx import convert, load_rates
+from apps.trips.models import Expense, ExpenseSplit, FxRate
+
+
+@pytest.mark.django_db
+def test_convert_uses_direct_and_inverse_rates():
+    load_rates([("EUR", "USD", "1.25")])
+    assert convert(Decimal("10.00"), "EUR", "USD") == Decimal("12.50")
+    assert convert(Decimal("12.50"), "USD", "EUR") == Decimal("10.00")
+
+
+@pytest.mark.django_db
+def test_mixed_currency_summary_uses_base_amounts(auth_client, user, tmp_path):
+    rates = tmp_path / "rates.csv"
+    rates.write_text("base,quote,rate\nEUR,USD,1.10\nUSD,JPY,150\n")
+    call_command("load_fx_rates", str(rates))
+    assert FxRate.objects.count() == 2
+
+    trip_resp = auth_client.post("/api/trips", {"title": "FX Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    assert trip_resp.data["base_currency"] == "USD"
+
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Dinner", "amount": "10.00", "currency": "eur"},
+        format="json",
+    )
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Sushi", "amount": "3000", "currency": "JPY"},
+        format="json",
+    )
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    assert summary[0]["paid"] == "31.00"
+    assert summary[0]["currency"] == "USD"
+
+    missing = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Coffee", "amount": "4.00", "currency": "GBP"},
+        format="json",
+    )
+    assert missing.status_code == 400
+
+    resp = auth_client.patch(f"/api/trips/{trip_id}", {"base_currency": "eur"}, format="json")
+    assert resp.status_code == 200
+    assert resp.data["base_currency"] == "EUR"
+    assert sorted(Expense.objects.values_list("base_amount", flat=True)) == [
+        Decimal("10.00"),
+        Decimal("18.18"),
+    ]
+    assert ExpenseSplit.objects.filter(expense__currency="JPY").get().base_amount == Decimal(
+        "18.18"
+    )
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    assert summary[0]["paid"] == "28.18"
+    assert summary[0]["currency"] == "EUR"
+    call_command("rebuild_balances", "--verify")
@@ -1,8 +1,19 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from django.db import connection
 from rest_framework.test import APIClient
 
 from apps.accounts.models import User
-from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.models import ItineraryItem, TripMember, TripRole, TripStatus
+
+
+def _authed(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
 
 
 @pytest.mark.django_db
@@ -25,18 +36,54 @@ def test_itinerary_crud_and_reorder(auth_client, user):
     assert list_resp.status_code == 200
     assert [item["title"] for item in list_resp.data] == ["Check in", "Dinner"]
 
+    reorder = {
+        "items": [
+            {"id": item1_resp.data["id"], "sort_order": 1},
+            {"id": item2_resp.data["id"], "sort_order": 0},
+        ]
+    }
     reorder_resp = auth_client.post(
-        f"/api/trips/{trip_id}/itinerary/reorder",
-        {
-            "items": [
-                {"id": item1_resp.data["id"], "sort_order": 1},
-                {"id": item2_resp.data["id"], "sort_order": 0},
-            ]
-        },
-        format="json",
+        f"/api/trips/{trip_id}/itinerary/reorder", reorder, format="json"
     )
     assert reorder_resp.status_code == 200
-    assert [item["title"] for item in reorder_resp.data] == ["Dinner", "Check in"]
+    assert reorder_resp.data == {item1_resp.data["id"]: 1, item2_resp.data["id"]: 0}
+    list_resp = auth_client.get(f"/api/trips/{trip_id}/itinerary")
+    assert [item["title"] for item in list_resp.data] == ["Dinner", "Check in"]
+
+    reorder["items"][0]["sort_order"] = 0
+    reorder["items"][1]["sort_order"] = 1
+    reorder_resp = auth_client.post(
+        f"/api/trips/{trip_id}/itinerary/reorder?full=1", reorder, format="json"
+    )
+    assert [item["title"] for item in reorder_resp.data] == ["Check in", "Dinner"]
+
+
+@pytest.mark.django_db
+def test_itinerary_reorder_rejects_foreign_items(auth_client, user, django_assert_num_queries):
+    trip_id = auth_client.post("/api/trips", {"title": "Mine"}, format="json").data["id"]
+    other_id = auth_client.post("/api/trips", {"title": "Other"}, format="json").data["id"]
+    mine = auth_client.post(
+        f"/api/trips/{trip_id}/itinerary", {"title": "Museum"}, format="json"
+    ).data["id"]
+    foreign = auth_client.post(
+        f"/api/trips/{other_id}/itinerary", {"title": "Beach"}, format="json"
+    ).data["id"]
+
+    url = f"/api/trips/{trip_id}/itinerary/reorder"
+    # savepoints, membership, the single UPDATE, the append counter and the revision bookkeeping
+    with django_assert_num_queries(10):
+        resp = auth_client.post(url, {"items": [{"id": mine, "sort_order": 3}]}, format="json")
+    assert resp.data == {mine: 3}
+
+    resp = auth_client.post(
+        url,
+        {"items": [{"id": mine, "sort_order": 0}, {"id": foreign, "sort_order": 1}]},
+        format="json",
+    )
+    assert resp.status_code == 400
+    positions = dict(ItineraryItem.objects.values_list("id", "sort_order"))
+    assert positions[uuid.UUID(foreign)] == 0
+    assert positions[uuid.UUID(mine)] == 3
 
 
 @pytest.mark.django_db
@@ -61,3 +108,155 @@ def test_itinerary_permissions_viewer_cannot_create(auth_client, user):
         format="json",
     )
     assert resp.status_code == 403
+
+
+@pytest.mark.django_db
+def test_itinerary_move_writes_one_rank(auth_client, user, django_assert_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Rank Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    ids = [
+        auth_client.post(
+            f"/api/trips/{trip_id}/itinerary", {"title": f"Stop {index}"}, format="json"
+        ).data["id"]
+        for index in range(5)
+    ]
+
+    def titles():
+        return [item["title"] for item in auth_client.get(f"/api/trips/{trip_id}/itinerary").data]
+
+    # savepoints, membership, anchor ranks, the neighbour, one UPDATE and the revision bookkeeping
+    with django_assert_num_queries(11):
+        resp = auth_client.post(
+            f"/api/trips/{trip_id}/itinerary/{ids[4]}/move", {"after": ids[0]}, format="json"
+        )
+    assert resp.status_code == 200
+    assert titles() == ["Stop 0", "Stop 4", "Stop 1", "Stop 2", "Stop 3"]
+    # Rank is the only ordering a client sees; positions are not kept in step with moves.
+    items = auth_client.get(f"/api/trips/{trip_id}/itinerary").data
+    assert not any("sort_order" in item for item in items)
+
+    auth_client.post(
+        f"/api/trips/{trip_id}/itinerary/{ids[0]}/move", {"after": ids[3]}, format="json"
+    )
+    auth_client.post(
+        f"/api/trips/{trip_id}/itinerary/{ids[2]}/move", {"before": ids[4]}, format="json"
+    )
+    assert titles() == ["Stop 2", "Stop 4", "Stop 1", "Stop 3", "Stop 0"]
+
+    # New items still land at the end after items were moved there.
+    auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Stop 5"}, format="json")
+    assert titles()[-2:] == ["Stop 0", "Stop 5"]
+
+    resp = auth_client.post(
+        f"/api/trips/{trip_id}/itinerary/{ids[1]}/move",
+        {"after": ids[0], "before": ids[2]},
+        format="json",
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_itinerary_parallel_appends_get_distinct_positions(user):
+    if connection.vendor == "sqlite":
+        pytest.skip("The in-memory SQLite test database cannot hold concurrent writers.")
+    trip_id = _authed(user).post("/api/trips", {"title": "Busy Trip"}, format="json").data["id"]
+    editors = [user]
+    for index in range(7):
+        editor = User.objects.create_user(email=f"editor{index}@example.com", password="x" * 12)
+        TripMember.objects.create(
+            trip_id=trip_id, user=editor, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+        )
+        editors.append(editor)
+    start = threading.Barrier(len(editors))
+
+    def append(editor):
+        client = _authed(editor)
+        try:
+            start.wait()
+            return client.post(
+                f"/api/trips/{trip_id}/itinerary", {"title": editor.email}, format="json"
+            ).status_code
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(editors)) as pool:
+        statuses = list(pool.map(append, editors))
+
+    assert statuses == [201] * len(editors)
+    items = _authed(user).get(f"/api/trips/{trip_id}/itinerary").data
+    positions = ItineraryItem.objects.filter(trip_id=trip_id).values_list("sort_order", flat=True)
+    assert sorted(positions) == list(range(len(editors)))
+    assert len({item["rank"] for item in items}) == len(editors)
+
+
+@pytest.mark.django_db
+def test_itinerary_conflicts_endpoint_and_inline_check(auth_client, user):
+    trip_id = auth_client.post("/api/trips", {"title": "Packed Day"}, format="json").data["id"]
+    url = f"/api/trips/{trip_id}/itinerary"
+    tour = auth_client.post(
+        url,
+        {"title": "Tour", "date": "2026-06-01", "start_time": "10:00", "end_time": "12:00"},
+        format="json",
+    ).data
+    auth_client.post(
+        url,
+        {"title": "Coffee", "date": "2026-06-01", "start_time": "12:00", "end_time": "12:30"},
+        format="json",
+    )
+    resp = auth_client.post(
+        f"{url}?check_conflicts=1",
+        {"title": "Lunch", "date": "2026-06-01", "start_time": "11:30", "end_time": "13:00"},
+        format="json",
+    )
+    assert resp.status_code == 201
+    assert [item["title"] for item in resp.data["conflicts"]] == ["Tour", "Coffee"]
+
+    resp = auth_client.get(f"{url}/conflicts")
+    assert resp.status_code == 200
+    assert [
+        [item["title"] for item in conflict["items"]] for conflict in resp.data["conflicts"]
+    ] == [["Tour", "Lunch"], ["Lunch", "Coffee"]]
+
+    resp = auth_client.patch(
+        f"{url}/{tour['id']}?check_conflicts=1",
+        {"start_time": "08:00", "end_time": "09:00"},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert resp.data["conflicts"] == []
+
+
+@pytest.mark.django_db
+def test_itinerary_date_window_grouping_and_fields(
+    auth_client, user, django_assert_max_num_queries
+):
+    trip_id = auth_client.post("/api/trips", {"title": "Month Away"}, format="json").data["id"]
+    url = f"/api/trips/{trip_id}/itinerary"
+    for title, day in [("Flight", "2026-07-01"), ("Hotel", "2026-07-02"), ("Pack", None)]:
+        auth_client.post(url, {"title": title, "date": day, "notes": "x" * 500}, format="json")
+    auth_client.post(url, {"title": "Museum", "date": "2026-07-01"}, format="json")
+
+    resp = auth_client.get(f"{url}?from=2026-07-01&to=2026-07-01")
+    assert [item["title"] for item in resp.data] == ["Flight", "Museum"]
+
+    with django_assert_max_num_queries(5) as captured:
+        resp = auth_client.get(f"{url}?from=2026-07-01&fields=title,date")
+    assert resp.data == [
+        {"id": resp.data[0]["id"], "title": "Flight", "date": "2026-07-01"},
+        {"id": resp.data[1]["id"], "title": "Museum", "date": "2026-07-01"},
+        {"id": resp.data[2]["id"], "title": "Hotel", "date": "2026-07-02"},
+    ]
+    (select,) = (
+        query["sql"] for query in captured.captured_queries if "trips_itineraryitem" in query["sql"]
+    )
+    assert '"notes"' not in select
+
+    resp = auth_client.get(f"{url}?group=day&fields=title")
+    assert [(day["date"], [item["title"] for item in day["items"]]) for day in resp.data] == [
+        ("2026-07-01", ["Flight", "Museum"]),
+        ("2026-07-02", ["Hotel"]),
+        (None, ["Pack"]),
+    ]
+
+    assert auth_client.get(f"{url}?fields=secret").status_code == 400
+    assert auth_client.get(f"{url}?from=July").status_code == 400
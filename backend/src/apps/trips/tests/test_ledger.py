@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.accounts.models import User
+from apps.trips.fx import load_rates
+from apps.trips.ledger import verify_balances
+from apps.trips.models import TripMember, TripMemberBalance, TripRole, TripStatus
+
+
+def _balances(trip_id):
+    return {
+        (str(row.user_id), row.currency): (row.paid, row.owed)
+        for row in TripMemberBalance.objects.filter(trip_id=trip_id)
+    }
+
+
+@pytest.mark.django_db
+def test_ledger_follows_expense_create_update_delete(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Ledger Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    me, them = str(user.id), str(friend.id)
+
+    expense_resp = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Hotel", "amount": "100.00", "participant_ids": [me, them]},
+        format="json",
+    )
+    expense_id = expense_resp.data["id"]
+    assert _balances(trip_id) == {
+        (me, "USD"): (Decimal("100.00"), Decimal("50.00")),
+        (them, "USD"): (Decimal("0.00"), Decimal("50.00")),
+    }
+
+    load_rates([("EUR", "USD", "1.10")])
+    auth_client.patch(
+        f"/api/expenses/{expense_id}",
+        {"amount": "60.00", "currency": "EUR", "paid_by": them},
+        format="json",
+    )
+    assert _balances(trip_id) == {
+        (me, "USD"): (Decimal("0.00"), Decimal("0.00")),
+        (them, "USD"): (Decimal("0.00"), Decimal("0.00")),
+        (me, "EUR"): (Decimal("0.00"), Decimal("30.00")),
+        (them, "EUR"): (Decimal("60.00"), Decimal("30.00")),
+    }
+    assert verify_balances(trip_id) == []
+
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    assert {row["user"]["id"]: row["net"] for row in summary} == {me: "-33.00", them: "33.00"}
+
+    assert auth_client.delete(f"/api/expenses/{expense_id}").status_code == 204
+    assert all(value == (0, 0) for value in _balances(trip_id).values())
+
+
+@pytest.mark.django_db
+def test_rebuild_balances_command_repairs_drift(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Drift Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses", {"title": "Taxi", "amount": "20.00"}, format="json"
+    )
+    call_command("rebuild_balances", "--verify")
+
+    TripMemberBalance.objects.filter(trip_id=trip_id).update(paid=Decimal("1.00"))
+    with pytest.raises(CommandError):
+        call_command("rebuild_balances", "--verify", "--trip", trip_id)
+
+    call_command("rebuild_balances", "--trip", trip_id)
+    call_command("rebuild_balances", "--verify")
+    assert _balances(trip_id) == {(str(user.id), "USD"): (Decimal("20.00"), Decimal("20.00"))}
@@ -0,0 +1,148 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.trips.membership import membership_cache_hit_rate, membership_cache_stats
+from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.permissions import get_trip_member
+
+
+@pytest.mark.django_db
+def test_membership_is_cached_across_requests(auth_client, django_assert_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Cached Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    auth_client.get(f"/api/trips/{trip_id}/chat/key")
+
+    # savepoint + release from ATOMIC_REQUESTS, the trip and the chat key; no membership query
+    with django_assert_num_queries(4) as captured:
+        resp = auth_client.get(f"/api/trips/{trip_id}/chat/key")
+    assert resp.status_code == 200
+    assert not any("trips_tripmember" in query["sql"] for query in captured.captured_queries)
+
+
+@pytest.mark.django_db
+def test_membership_is_cached_across_lookups(auth_client, user, django_assert_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Cached Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    assert get_trip_member(user, trip_id).role == TripRole.OWNER
+
+    with django_assert_num_queries(0):
+        member = get_trip_member(user, trip_id)
+    assert member.role == TripRole.OWNER
+
+
+@pytest.mark.django_db
+def test_membership_cache_counts_hits_and_misses(auth_client, user):
+    trip_id = auth_client.post("/api/trips", {"title": "Counted Trip"}, format="json").data["id"]
+    cache.delete_many(["trip_member:stats:hit", "trip_member:stats:miss"])
+    cache.delete(f"trip_member:{user.id}:{trip_id}")
+    assert membership_cache_hit_rate() is None
+
+    get_trip_member(user, trip_id)
+    assert membership_cache_stats() == {"hit": 0, "miss": 1}
+
+    get_trip_member(user, trip_id)
+    get_trip_member(user, trip_id)
+    assert membership_cache_stats() == {"hit": 2, "miss": 1}
+    assert membership_cache_hit_rate() == pytest.approx(2 / 3)
+
+
+@pytest.mark.django_db
+def test_membership_cache_invalidated_on_role_change_and_removal(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Team Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    viewer = User.objects.create_user(email="viewer@example.com", password="Password123!")
+    membership = TripMember.objects.create(
+        trip_id=trip_id,
+        user=viewer,
+        role=TripRole.VIEWER,
+        status=TripStatus.ACTIVE,
+    )
+    viewer_client = APIClient()
+    viewer_client.force_authenticate(user=viewer)
+
+    payload = {"title": "Museum"}
+    resp = viewer_client.post(f"/api/trips/{trip_id}/itinerary", payload, format="json")
+    assert resp.status_code == 403
+
+    membership.role = TripRole.EDITOR
+    membership.save()
+    resp = viewer_client.post(f"/api/trips/{trip_id}/itinerary", payload, format="json")
+    assert resp.status_code == 201
+
+    membership.delete()
+    resp = viewer_client.get(f"/api/trips/{trip_id}/itinerary")
+    assert resp.status_code == 403
+
+
+@pytest.mark.django_db
+def test_membership_cache_dropped_again_on_commit(
+    auth_client, user, django_capture_on_commit_callbacks
+):
+    trip_id = auth_client.post("/api/trips", {"title": "Commit Trip"}, format="json").data["id"]
+    viewer = User.objects.create_user(email="viewer@example.com", password="Password123!")
+    membership = TripMember.objects.create(
+        trip_id=trip_id, user=viewer, role=TripRole.VIEWER, status=TripStatus.ACTIVE
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        membership.role = TripRole.EDITOR
+        membership.save()
+        # A concurrent request still sees the committed viewer row and caches it.
+        cache.set(f"trip_member:{viewer.id}:{trip_id}", (membership.id, TripRole.VIEWER))
+
+    assert get_trip_member(viewer, trip_id).role == TripRole.EDITOR
+
+
+@pytest.mark.django_db
+def test_child_object_resolved_with_membership_in_one_query(
+    auth_client, user, django_assert_num_queries
+):
+    trip_resp = auth_client.post("/api/trips", {"title": "Resolver Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    item_resp = auth_client.post(
+        f"/api/trips/{trip_id}/itinerary", {"title": "Check in"}, format="json"
+    )
+    item_id = item_resp.data["id"]
+
+    outsider = User.objects.create_user(email="outsider@example.com", password="Password123!")
+    outsider_client = APIClient()
+    outsider_client.force_authenticate(user=outsider)
+    assert outsider_client.get(f"/api/trips/{trip_id}/itinerary").status_code == 403
+    assert outsider_client.delete(f"/api/itinerary/{item_id}").status_code == 403
+
+    # savepoint + release from ATOMIC_REQUESTS, the joined lookup, the delete and, last, the
+    # revision bump (update, read back, change row)
+    with django_assert_num_queries(7) as captured:
+        resp = auth_client.delete(f"/api/itinerary/{item_id}")
+    assert resp.status_code == 204
+    assert '"revision"' in captured.captured_queries[3]["sql"]
+    assert auth_client.delete(f"/api/itinerary/{item_id}").status_code == 404
+
+
+@pytest.mark.django_db
+def test_poll_resolved_with_membership_in_one_query(auth_client, user, django_assert_num_queries):
+    trip_resp = auth_client.post("/api/trips", {"title": "Resolver Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    poll_resp = auth_client.post(
+        f"/api/trips/{trip_id}/polls", {"question": "Where?", "options": ["A", "B"]}, format="json"
+    )
+    poll_id = poll_resp.data["id"]
+
+    outsider = User.objects.create_user(email="outsider@example.com", password="Password123!")
+    outsider_client = APIClient()
+    outsider_client.force_authenticate(user=outsider)
+    assert outsider_client.get(f"/api/polls/{poll_id}").status_code == 403
+
+    # savepoint + release from ATOMIC_REQUESTS, the joined lookup and two prefetches
+    with django_assert_num_queries(5):
+        resp = auth_client.get(f"/api/polls/{poll_id}")
+    assert resp.status_code == 200
+    assert len(resp.data["options"]) == 2
+
+    assert auth_client.delete(f"/api/polls/{poll_id}").status_code == 204
+    assert auth_client.get(f"/api/polls/{poll_id}").status_code == 404
@@ -0,0 +1,46 @@
+import pytest
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+
+
+@pytest.mark.django_db
+def test_my_balances_rolls_up_trips_and_counterparties(
+    auth_client, user, django_assert_max_num_queries
+):
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    trip_ids = []
+    for title in ["Alps", "Beach"]:
+        trip_id = auth_client.post("/api/trips", {"title": title}, format="json").data["id"]
+        TripMember.objects.create(
+            trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+        )
+        trip_ids.append(trip_id)
+    auth_client.post(
+        f"/api/trips/{trip_ids[0]}/expenses", {"title": "Cabin", "amount": "100.00"}, format="json"
+    )
+    auth_client.post(
+        f"/api/trips/{trip_ids[1]}/expenses",
+        {"title": "Boat", "amount": "30.00", "paid_by": str(friend.id)},
+        format="json",
+    )
+
+    with django_assert_max_num_queries(5):
+        resp = auth_client.get("/api/me/balances")
+    assert resp.status_code == 200
+    assert [
+        (row["trip"]["title"], row["paid"], row["owed"], row["net"], row["currency"])
+        for row in resp.data["trips"]
+    ] == [
+        ("Alps", "100.00", "50.00", "50.00", "USD"),
+        ("Beach", "0.00", "15.00", "-15.00", "USD"),
+    ]
+    assert [
+        (row["user"]["id"], row["net"], row["currency"]) for row in resp.data["counterparties"]
+    ] == [(str(friend.id), "35.00", "USD")]
+
+    # Trips the caller has left no longer count.
+    TripMember.objects.filter(trip_id=trip_ids[0], user=user).delete()
+    data = auth_client.get("/api/me/balances").data
+    assert [row["trip"]["title"] for row in data["trips"]] == ["Beach"]
+    assert data["counterparties"][0]["net"] == "-15.00"
@@ -0,0 +1,69 @@
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from hypothesis import given
+from hypothesis import strategies as st
+
+from apps.trips.models import ItineraryItem
+from apps.trips.ranking import key_between, rank_for_position
+
+
+def test_position_keys_sort_like_positions():
+    keys = [rank_for_position(position) for position in (0, 1, 35, 36, 1295, 10**6)]
+    assert keys == sorted(keys)
+    assert len(set(map(len, keys))) == 1
+    with pytest.raises(ValueError):
+        rank_for_position(36**6)
+
+
+def test_key_between_edges():
+    first = rank_for_position(0)
+    assert key_between(None, first) < first
+    assert rank_for_position(3) < key_between(rank_for_position(3), None) < rank_for_position(4)
+    assert key_between(None, None)
+    with pytest.raises(ValueError):
+        key_between(first, first)
+
+
+@given(st.lists(st.integers(min_value=0, max_value=1000), max_size=200))
+def test_key_between_keeps_order_under_any_insertions(slots):
+    keys = [rank_for_position(0), rank_for_position(1)]
+    for slot in slots:
+        index = slot % (len(keys) + 1)
+        low = keys[index - 1] if index else None
+        high = keys[index] if index < len(keys) else None
+        key = key_between(low, high)
+        assert (low is None or low < key) and (high is None or key < high)
+        assert not key.endswith("0")
+        keys.insert(index, key)
+    assert keys == sorted(keys)
+
+
+@pytest.mark.django_db
+def test_rebalance_keeps_order_with_position_keys(auth_client, user):
+    trip_id = auth_client.post("/api/trips", {"title": "Long Keys"}, format="json").data["id"]
+    ids = [
+        auth_client.post(
+            f"/api/trips/{trip_id}/itinerary", {"title": f"Stop {index}"}, format="json"
+        ).data["id"]
+        for index in range(3)
+    ]
+    for _ in range(5):
+        auth_client.post(
+            f"/api/trips/{trip_id}/itinerary/{ids[2]}/move", {"after": ids[0]}, format="json"
+        )
+        auth_client.post(
+            f"/api/trips/{trip_id}/itinerary/{ids[1]}/move", {"after": ids[0]}, format="json"
+        )
+    before = auth_client.get(f"/api/trips/{trip_id}/itinerary").data
+
+    call_command("rebalance_itinerary", trip=trip_id, stdout=StringIO())
+
+    after = auth_client.get(f"/api/trips/{trip_id}/itinerary").data
+    assert [item["id"] for item in after] == [item["id"] for item in before]
+    positions = dict(ItineraryItem.objects.values_list("id", "sort_order"))
+    assert [(positions[uuid.UUID(item["id"])], item["rank"]) for item in after] == [
+        (position, rank_for_position(position)) for position in range(3)
+    ]
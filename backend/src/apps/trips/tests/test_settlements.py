@@ -0,0 +1,66 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.settlements import settle
+
+
+def _apply(balances, transfers):
+    remaining = dict(balances)
+    for debtor, creditor, cents in transfers:
+        assert cents > 0
+        remaining[debtor] += cents
+        remaining[creditor] -= cents
+    return remaining
+
+
+def test_settle_clears_balances_with_few_transfers():
+    balances = {"a": 5000, "b": -2000, "c": -2000, "d": -1000, "e": 0}
+    transfers = settle(balances)
+    assert transfers == [("b", "a", 2000), ("c", "a", 2000), ("d", "a", 1000)]
+    assert set(_apply(balances, transfers).values()) == {0}
+
+
+def test_settle_hundreds_of_members():
+    rng = random.Random(42)
+    balances = {f"user-{index}": rng.randint(-500_000, 500_000) for index in range(999)}
+    balances["user-999"] = -sum(balances.values())
+
+    transfers = settle(balances)
+
+    assert set(_apply(balances, transfers).values()) == {0}
+    # Each transfer settles at least one member in full.
+    assert len(transfers) <= sum(1 for cents in balances.values() if cents) - 1
+
+
+@pytest.mark.django_db
+def test_settlements_endpoint(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Settle Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+
+    friends = [
+        User.objects.create_user(email=f"friend{index}@example.com", password="Password123!")
+        for index in range(2)
+    ]
+    for friend in friends:
+        TripMember.objects.create(
+            trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+        )
+    participant_ids = [str(user.id)] + [str(friend.id) for friend in friends]
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Hotel", "amount": "100.00", "participant_ids": participant_ids},
+        format="json",
+    )
+
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    payer_net = next(Decimal(row["net"]) for row in summary if row["user"]["id"] == str(user.id))
+
+    resp = auth_client.get(f"/api/trips/{trip_id}/expenses/settlements")
+    assert resp.status_code == 200
+    assert len(resp.data) == 2
+    assert {row["to_user"]["id"] for row in resp.data} == {str(user.id)}
+    assert sum(Decimal(row["amount"]) for row in resp.data) == payer_net
@@ -0,0 +1,164 @@
+from decimal import Decimal
+from itertools import pairwise
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from rest_framework.exceptions import ValidationError
+
+from apps.accounts.models import User
+from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.splits import SplitType, allocate, split_amount
+
+cents = st.integers(min_value=-(10**9), max_value=10**9)
+weights = st.lists(st.integers(min_value=0, max_value=10**6), min_size=1, max_size=300)
+
+
+def test_allocate_keeps_total_and_favours_largest_remainders():
+    assert allocate(100, [1, 1, 1]) == [34, 33, 33]
+    assert allocate(1001, [500, 250, 250]) == [501, 250, 250]
+    assert sum(allocate(-7, [3, 3, 1])) == -7
+    assert allocate(5, [0, 0]) == [3, 2]
+
+
+@given(total=cents, weights=weights)
+def test_allocate_is_exact_and_within_one_unit(total, weights):
+    parts = allocate(total, weights)
+    assert sum(parts) == total
+    weight_sum = sum(weights) or len(weights)
+    for part, weight in zip(parts, weights if sum(weights) else [1] * len(weights), strict=True):
+        assert abs(part * weight_sum - total * weight) < weight_sum
+
+
+@given(
+    units=st.integers(min_value=0, max_value=10**9),
+    count=st.integers(min_value=1, max_value=500),
+    currency=st.sampled_from(["USD", "EUR", "JPY", "KRW"]),
+)
+def test_equal_split_sums_exactly_for_any_currency(units, count, currency):
+    exponent = 0 if currency in ("JPY", "KRW") else 2
+    amount = Decimal(units).scaleb(-exponent)
+    shares = split_amount(amount, currency, SplitType.EQUAL, count=count)
+    assert sum(shares) == amount
+    assert max(shares) - min(shares) <= Decimal(1).scaleb(-exponent)
+
+
+@given(
+    units=st.integers(min_value=0, max_value=10**9),
+    raw_weights=st.lists(
+        st.decimals(min_value=0, max_value=1000, places=2), min_size=1, max_size=200
+    ).filter(any),
+)
+def test_weighted_split_sums_exactly(units, raw_weights):
+    amount = Decimal(units).scaleb(-2)
+    shares = split_amount(amount, "USD", SplitType.WEIGHTED, raw_weights)
+    assert sum(shares) == amount
+    assert all(share >= 0 for share in shares)
+
+
+@given(
+    units=st.integers(min_value=0, max_value=10**9),
+    cuts=st.lists(st.integers(min_value=0, max_value=10000), max_size=50),
+)
+def test_percentage_split_sums_exactly(units, cuts):
+    bounds = [0, *sorted(cuts), 10000]
+    percentages = [Decimal(high - low).scaleb(-2) for low, high in pairwise(bounds)]
+    amount = Decimal(units).scaleb(-2)
+    shares = split_amount(amount, "USD", SplitType.PERCENTAGE, percentages)
+    assert sum(shares) == amount
+
+
+def test_split_validation():
+    with pytest.raises(ValidationError):
+        split_amount(Decimal("10.00"), "USD", SplitType.PERCENTAGE, [Decimal("50"), Decimal("40")])
+    with pytest.raises(ValidationError):
+        split_amount(Decimal("10.00"), "USD", SplitType.EXACT, [Decimal("5"), Decimal("4")])
+    with pytest.raises(ValidationError):
+        split_amount(Decimal("10.50"), "JPY", SplitType.EQUAL, count=2)
+    assert split_amount(Decimal("100"), "JPY", SplitType.EQUAL, count=3) == [34, 33, 33]
+
+
+@pytest.mark.django_db
+def test_weighted_and_percentage_expenses(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Split Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+
+    resp = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {
+            "title": "Cabin",
+            "amount": "100.00",
+            "split_type": "weighted",
+            "splits": [
+                {"user_id": str(user.id), "weight": "2"},
+                {"user_id": str(friend.id), "weight": "1"},
+            ],
+        },
+        format="json",
+    )
+    assert resp.status_code == 201
+    shares = {split["user"]["id"]: split["amount"] for split in resp.data["splits"]}
+    assert shares == {str(user.id): "66.67", str(friend.id): "33.33"}
+
+    resp = auth_client.patch(
+        f"/api/expenses/{resp.data['id']}",
+        {
+            "split_type": "percentage",
+            "splits": [
+                {"user_id": str(user.id), "percentage": "25"},
+                {"user_id": str(friend.id), "percentage": "75"},
+            ],
+        },
+        format="json",
+    )
+    assert resp.status_code == 200
+    shares = {split["user"]["id"]: split["amount"] for split in resp.data["splits"]}
+    assert shares == {str(user.id): "25.00", str(friend.id): "75.00"}
+
+    missing = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Bad", "amount": "10.00", "split_type": "weighted"},
+        format="json",
+    )
+    assert missing.status_code == 400
+
+
+@pytest.mark.django_db
+def test_patch_split_type_alone_resplits(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Resplit Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    friend = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=friend, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    resp = auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {
+            "title": "Tickets",
+            "amount": "10.00",
+            "split_type": "exact",
+            "splits": [
+                {"user_id": str(user.id), "amount": "9.00"},
+                {"user_id": str(friend.id), "amount": "1.00"},
+            ],
+        },
+        format="json",
+    )
+    assert resp.status_code == 201
+
+    resp = auth_client.patch(
+        f"/api/expenses/{resp.data['id']}", {"split_type": "equal"}, format="json"
+    )
+    assert resp.status_code == 200
+    shares = {split["user"]["id"]: split["amount"] for split in resp.data["splits"]}
+    assert shares == {str(user.id): "5.00", str(friend.id): "5.00"}
+
+    summary = auth_client.get(f"/api/trips/{trip_id}/expenses/summary").data
+    assert {row["user"]["id"]: row["owed"] for row in summary} == {
+        str(user.id): "5.00",
+        str(friend.id): "5.00",
+    }
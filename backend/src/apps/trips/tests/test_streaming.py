@@ -0,0 +1,77 @@
+import json
+import warnings
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from apps.common.streaming import ChunkedStreamingResponse
+from apps.trips.models import ChatMessage
+
+
+def _streamed(response):
+    assert response.status_code == 200
+    assert response.streaming
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+def test_streamed_lists_match_buffered_lists(auth_client, user):
+    trip_resp = auth_client.post("/api/trips", {"title": "Stream Trip"}, format="json")
+    trip_id = trip_resp.data["id"]
+    for title in ["Check in", "Museum", "Dinner"]:
+        auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": title}, format="json")
+    auth_client.post(
+        f"/api/trips/{trip_id}/expenses",
+        {"title": "Taxi", "amount": "30.00", "currency": "USD"},
+        format="json",
+    )
+    for index in range(3):
+        ChatMessage.objects.create(trip_id=trip_id, sender=user, content=f"Message {index}")
+
+    for path in [
+        f"/api/trips/{trip_id}/itinerary",
+        f"/api/trips/{trip_id}/expenses",
+        f"/api/trips/{trip_id}/chat/messages?limit=2",
+        "/api/invites/sent",
+    ]:
+        buffered = auth_client.get(path)
+        separator = "&" if "?" in path else "?"
+        streamed = auth_client.get(f"{path}{separator}stream=1")
+        assert _streamed(streamed) == json.loads(buffered.content), path
+
+    messages = _streamed(auth_client.get(f"/api/trips/{trip_id}/chat/messages?limit=2&stream=1"))
+    assert [message["content"] for message in messages] == ["Message 1", "Message 2"]
+
+
+def test_chunked_response_pulls_one_chunk_at_a_time():
+    produced = []
+
+    def chunks():
+        for index in range(3):
+            produced.append(index)
+            yield b"x"
+
+    async def first_part():
+        parts = aiter(ChunkedStreamingResponse(chunks()))
+        part = await anext(parts)
+        await parts.aclose()
+        return part
+
+    assert async_to_sync(first_part)() == b"x"
+    assert produced == [0]
+
+
+@pytest.mark.django_db
+def test_streamed_list_is_not_buffered_under_asgi(auth_client, asgi_get):
+    trip_id = auth_client.post("/api/trips", {"title": "ASGI Trip"}, format="json").data["id"]
+    for title in ["Check in", "Museum"]:
+        auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": title}, format="json")
+
+    with warnings.catch_warnings():
+        # Django warns when it has to collect a sync iterator before serving it over ASGI.
+        warnings.filterwarnings("error", message="StreamingHttpResponse must consume")
+        messages = asgi_get(f"/api/trips/{trip_id}/itinerary", "stream=1")
+
+    assert messages[0]["status"] == 200
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    assert [item["title"] for item in json.loads(body)] == ["Check in", "Museum"]
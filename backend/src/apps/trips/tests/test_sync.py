@@ -0,0 +1,59 @@
+import pytest
+
+from apps.trips.models import Trip, TripChange
+
+
+@pytest.mark.django_db
+def test_changes_since_returns_upserts_and_tombstones(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "Sync Trip"}, format="json").data["id"]
+    baseline = auth_client.get(f"/api/trips/{trip_id}/changes")
+    assert baseline.status_code == 200
+    assert baseline.data["changes"]["trip"][0]["title"] == "Sync Trip"
+    assert len(baseline.data["changes"]["member"]) == 1
+    since = baseline.data["revision"]
+
+    keep = auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Keep"}, format="json")
+    drop = auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Drop"}, format="json")
+    auth_client.delete(f"/api/itinerary/{drop.data['id']}")
+
+    delta = auth_client.get(f"/api/trips/{trip_id}/changes", {"since": since})
+    assert delta.data["revision"] == since + 3
+    assert [item["title"] for item in delta.data["changes"]["itinerary"]] == ["Keep"]
+    assert delta.data["deleted"] == {"itinerary": [drop.data["id"]]}
+    assert "trip" not in delta.data["changes"]
+
+    keep_id = keep.data["id"]
+    auth_client.patch(f"/api/itinerary/{keep_id}", {"title": "Kept"}, format="json")
+    latest = auth_client.get(f"/api/trips/{trip_id}/changes", {"since": delta.data["revision"]})
+    assert [item["title"] for item in latest.data["changes"]["itinerary"]] == ["Kept"]
+
+    idle = auth_client.get(f"/api/trips/{trip_id}/changes", {"since": latest.data["revision"]})
+    assert idle.data["changes"] == {}
+    assert idle.data["deleted"] == {}
+
+
+@pytest.mark.django_db
+def test_child_writes_bump_parent_and_trip_delete_clears_log(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "Sync Trip"}, format="json").data["id"]
+    poll = auth_client.post(
+        f"/api/trips/{trip_id}/polls", {"question": "Where?", "options": ["A", "B"]}, format="json"
+    ).data
+    since = Trip.objects.get(id=trip_id).revision
+
+    auth_client.post(f"/api/polls/{poll['id']}/vote", {"option_id": poll["options"][0]["id"]})
+    delta = auth_client.get(f"/api/trips/{trip_id}/changes", {"since": since})
+    assert delta.data["changes"]["poll"][0]["user_vote_option_id"] == poll["options"][0]["id"]
+
+    assert auth_client.delete(f"/api/trips/{trip_id}").status_code == 204
+    assert not TripChange.objects.filter(trip_id=trip_id).exists()
+
+
+@pytest.mark.django_db
+def test_request_records_its_changes_under_one_revision(auth_client):
+    trip_id = auth_client.post("/api/trips", {"title": "Sync Trip"}, format="json").data["id"]
+
+    changes = TripChange.objects.filter(trip_id=trip_id)
+    assert sorted(changes.values_list("entity", flat=True)) == ["member", "trip"]
+    assert set(changes.values_list("revision", flat=True)) == {
+        Trip.objects.get(id=trip_id).revision
+    }
@@ -2,7 +2,7 @@ import pytest
 from rest_framework.test import APIClient
 
 from apps.accounts.models import User
-from apps.trips.models import TripMember, TripRole, TripStatus
+from apps.trips.models import ChatMessage, TripMember, TripRole, TripStatus
 
 
 @pytest.mark.django_db
@@ -50,3 +50,47 @@ def test_trip_permissions_viewer_cannot_update_owner_can_update(auth_client, use
     )
     assert owner_resp.status_code == 200
     assert owner_resp.data["title"] == "Rome Updated"
+
+
+@pytest.mark.django_db
+def test_trip_list_keyset_pagination(auth_client):
+    for idx in range(5):
+        auth_client.post("/api/trips", {"title": f"Trip {idx}"}, format="json")
+
+    first = auth_client.get("/api/trips", {"limit": 2})
+    assert first.status_code == 200
+    assert [trip["title"] for trip in first.data["results"]] == ["Trip 4", "Trip 3"]
+
+    titles = [trip["title"] for trip in first.data["results"]]
+    cursor = first.data["next"]
+    while cursor:
+        page = auth_client.get("/api/trips", {"limit": 2, "cursor": cursor})
+        titles.extend(trip["title"] for trip in page.data["results"])
+        cursor = page.data["next"]
+    assert titles == ["Trip 4", "Trip 3", "Trip 2", "Trip 1", "Trip 0"]
+
+    assert auth_client.get("/api/trips", {"cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_trip_list_counts(auth_client, user):
+    trip_id = auth_client.post("/api/trips", {"title": "Lisbon"}, format="json").data["id"]
+    other = User.objects.create_user(email="friend@example.com", password="Password123!")
+    TripMember.objects.create(
+        trip_id=trip_id, user=other, role=TripRole.EDITOR, status=TripStatus.ACTIVE
+    )
+    auth_client.post(f"/api/trips/{trip_id}/itinerary", {"title": "Tram 28"}, format="json")
+    ChatMessage.objects.create(trip_id=trip_id, sender=other, content="Hi")
+    ChatMessage.objects.create(trip_id=trip_id, sender=user, content="Hello")
+
+    resp = auth_client.get("/api/trips", {"include": "counts"})
+    assert resp.status_code == 200
+    trip = resp.data[0]
+    assert trip["member_count"] == 2
+    assert trip["itinerary_count"] == 1
+    assert trip["expense_count"] == 0
+    assert trip["unread_count"] == 1
+
+    auth_client.get(f"/api/trips/{trip_id}/chat/messages")
+    resp = auth_client.get("/api/trips", {"include": "counts"})
+    assert resp.data[0]["unread_count"] == 0
@@ -2,24 +2,34 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    TripChatKeyView,
-    InviteAcceptView,
+    ExpenseDetailView,
     InviteAcceptByIdView,
+    InviteAcceptView,
     InviteDeclineView,
     InviteRevokeView,
     ItineraryItemDetailView,
+    ItineraryItemMoveView,
+    MyBalancesView,
     PollDetailView,
     PollVoteView,
     ReceivedInvitesView,
     SentInvitesView,
     TripCalendarExportView,
-    ExpenseDetailView,
-    TripExpensesView,
+    TripChangesView,
+    TripChatKeyView,
+    TripChatMessagesView,
+    TripDashboardView,
+    TripExpenseAnalyticsView,
+    TripExpenseBulkView,
+    TripExpenseExportView,
+    TripExpenseSettlementsView,
     TripExpenseSummaryView,
+    TripExpensesView,
+    TripExpenseTimelineView,
     TripInvitesView,
+    TripItineraryConflictsView,
     TripItineraryReorderView,
     TripItineraryView,
-    TripChatMessagesView,
     TripMembersView,
     TripPollsView,
     TripUserSearchView,
@@ -31,17 +41,29 @@ router.register("trips", TripViewSet, basename="trips")
 
 urlpatterns = [
     path("trips/<uuid:trip_id>/itinerary", TripItineraryView.as_view(), name="trip-itinerary"),
+    path(
+        "trips/<uuid:trip_id>/itinerary/conflicts",
+        TripItineraryConflictsView.as_view(),
+        name="trip-itinerary-conflicts",
+    ),
     path(
         "trips/<uuid:trip_id>/itinerary/reorder",
         TripItineraryReorderView.as_view(),
         name="trip-itinerary-reorder",
     ),
+    path(
+        "trips/<uuid:trip_id>/itinerary/<uuid:item_id>/move",
+        ItineraryItemMoveView.as_view(),
+        name="trip-itinerary-item-move",
+    ),
     path(
         "trips/<uuid:trip_id>/itinerary/<uuid:item_id>",
         ItineraryItemDetailView.as_view(),
         name="trip-itinerary-item-detail",
     ),
-    path("itinerary/<uuid:item_id>", ItineraryItemDetailView.as_view(), name="itinerary-item-detail"),
+    path(
+        "itinerary/<uuid:item_id>", ItineraryItemDetailView.as_view(), name="itinerary-item-detail"
+    ),
     path("trips/<uuid:trip_id>/invites", TripInvitesView.as_view(), name="trip-invites"),
     path(
         "trips/<uuid:trip_id>/chat/messages",
@@ -49,20 +71,52 @@ urlpatterns = [
         name="trip-chat-messages",
     ),
     path("trips/<uuid:trip_id>/chat/key", TripChatKeyView.as_view(), name="trip-chat-key"),
-    path("trips/<uuid:trip_id>/calendar", TripCalendarExportView.as_view(), name="trip-calendar-export"),
+    path(
+        "trips/<uuid:trip_id>/calendar",
+        TripCalendarExportView.as_view(),
+        name="trip-calendar-export",
+    ),
     path("trips/<uuid:trip_id>/expenses", TripExpensesView.as_view(), name="trip-expenses"),
+    path(
+        "trips/<uuid:trip_id>/expenses/bulk",
+        TripExpenseBulkView.as_view(),
+        name="trip-expenses-bulk",
+    ),
+    path(
+        "trips/<uuid:trip_id>/expenses/analytics",
+        TripExpenseAnalyticsView.as_view(),
+        name="trip-expenses-analytics",
+    ),
+    path(
+        "trips/<uuid:trip_id>/expenses/timeline",
+        TripExpenseTimelineView.as_view(),
+        name="trip-expenses-timeline",
+    ),
+    path(
+        "trips/<uuid:trip_id>/expenses/export",
+        TripExpenseExportView.as_view(),
+        name="trip-expenses-export",
+    ),
     path("expenses/<uuid:expense_id>", ExpenseDetailView.as_view(), name="expense-detail"),
     path(
         "trips/<uuid:trip_id>/expenses/summary",
         TripExpenseSummaryView.as_view(),
         name="trip-expenses-summary",
     ),
+    path(
+        "trips/<uuid:trip_id>/expenses/settlements",
+        TripExpenseSettlementsView.as_view(),
+        name="trip-expenses-settlements",
+    ),
     path("invites/accept", InviteAcceptView.as_view(), name="invite-accept"),
     path("invites/accept-by-id", InviteAcceptByIdView.as_view(), name="invite-accept-by-id"),
     path("invites/decline", InviteDeclineView.as_view(), name="invite-decline"),
     path("invites/revoke", InviteRevokeView.as_view(), name="invite-revoke"),
     path("invites/sent", SentInvitesView.as_view(), name="invites-sent"),
+    path("me/balances", MyBalancesView.as_view(), name="my-balances"),
     path("invites/received", ReceivedInvitesView.as_view(), name="invites-received"),
+    path("trips/<uuid:trip_id>/changes", TripChangesView.as_view(), name="trip-changes"),
+    path("trips/<uuid:trip_id>/dashboard", TripDashboardView.as_view(), name="trip-dashboard"),
     path("trips/<uuid:trip_id>/members", TripMembersView.as_view(), name="trip-members"),
     path("trips/<uuid:trip_id>/user-search", TripUserSearchView.as_view(), name="trip-user-search"),
     path("trips/<uuid:trip_id>/polls", TripPollsView.as_view(), name="trip-polls"),
@@ -1,26 +1,49 @@
+import codecs
+import csv
 import hashlib
 import logging
 import secrets
-from datetime import datetime, timedelta, timezone as dt_timezone
-from decimal import Decimal, ROUND_HALF_UP
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
-from django.http import HttpResponse
 from django.db import transaction
-from django.db.models import Count, Max, Prefetch, Sum, Q
+from django.db.models import Case, Count, Exists, F, Max, OuterRef, Prefetch, Q, Subquery, Sum, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.db.models.lookups import IsNull
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
-from django.utils.dateparse import parse_datetime
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, parse_http_date_safe
 from rest_framework import permissions, status, viewsets
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 
+from apps.common.streaming import (
+    ChunkedStreamingResponse,
+    iter_csv,
+    iter_ndjson,
+    stream_queryset,
+    wants_stream,
+)
+
+from .conflicts import find_conflicts
+from .fx import convert_expense, reconvert_trip_expenses
+from .ics import EVENT_COLUMNS, iter_calendar
+from .ledger import apply_deltas, balance_timeline, expense_deltas
+from .membership import fetch_trip_object, invalidate_trip_member, resolve_trip_object
 from .models import (
     ChatMessage,
     Expense,
@@ -30,53 +53,142 @@ from .models import (
     Poll,
     PollOption,
     Trip,
+    TripChange,
     TripChatKey,
+    TripEntity,
     TripInvite,
     TripMember,
+    TripMemberBalance,
     TripRole,
     TripStatus,
     Vote,
 )
-from .permissions import get_trip_member, is_editor_or_owner, is_owner, TripPermission
+from .pagination import KeysetPagination
+from .permissions import TripPermission, is_editor_or_owner, is_owner
+from .ranking import (
+    REBALANCE_LENGTH,
+    allocate_position,
+    key_between,
+    rank_for_position,
+    rebalance_ranks,
+    reserve_positions,
+    write_positions,
+)
 from .serializers import (
     ChatMessageSerializer,
     ExpenseCreateSerializer,
-    ExpenseUpdateSerializer,
     ExpenseSerializer,
     ExpenseSummarySerializer,
+    ExpenseUpdateSerializer,
     InviteAcceptSerializer,
     InviteIdSerializer,
     InviteRevokeSerializer,
     ItineraryItemSerializer,
+    ItineraryMoveSerializer,
     ItineraryReorderSerializer,
+    MemberUserSerializer,
+    MyBalancesSerializer,
+    NormalizedExpenseSerializer,
     PollCreateSerializer,
     PollSerializer,
     PollUpdateSerializer,
     PollVoteSerializer,
+    SettlementSerializer,
+    TripCountsSerializer,
     TripInviteCreateSerializer,
-    TripInviteSerializer,
     TripInviteSentSerializer,
+    TripInviteSerializer,
     TripMemberSerializer,
     TripSerializer,
     UserLookupSerializer,
 )
+from .settlements import from_cents, settle, to_cents
+from .splits import SPLIT_VALUE_FIELDS, SplitType, split_amount
+from .sync import (
+    changes_since,
+    collection_etag,
+    collection_revision,
+    deferred_changes,
+    etag_matches,
+    record_changes,
+)
 
 logger = logging.getLogger("chat")
 
 
-class TripViewSet(viewsets.ModelViewSet):
+def _count_subquery(queryset):
+    counted = queryset.order_by().values("trip_id").annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(counted[:1]), 0)
+
+
+def _annotate_trip_counts(queryset, user):
+    last_read = TripMember.objects.filter(trip=OuterRef("pk"), user=user).values("last_read_at")
+    unread = ChatMessage.objects.filter(trip=OuterRef("pk")).exclude(sender=user)
+    unread = unread.filter(
+        Q(IsNull(OuterRef("caller_last_read_at"), True))
+        | Q(created_at__gt=OuterRef("caller_last_read_at"))
+    )
+    return queryset.annotate(caller_last_read_at=Subquery(last_read[:1])).annotate(
+        member_count=_count_subquery(
+            TripMember.objects.filter(trip=OuterRef("pk"), status=TripStatus.ACTIVE)
+        ),
+        itinerary_count=_count_subquery(ItineraryItem.objects.filter(trip=OuterRef("pk"))),
+        expense_count=_count_subquery(Expense.objects.filter(trip=OuterRef("pk"))),
+        unread_count=_count_subquery(unread),
+    )
+
+
+class DeferredChangesMixin:
+    """Record sync changes when the view is done, just before the request transaction commits."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with deferred_changes():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class TripViewSet(DeferredChangesMixin, viewsets.ModelViewSet):
     serializer_class = TripSerializer
     permission_classes = [permissions.IsAuthenticated, TripPermission]
+    pagination_class = KeysetPagination
+
+    def _include_counts(self):
+        return self.action == "list" and self.request.query_params.get("include") == "counts"
 
     def get_queryset(self):
-        return (
-            Trip.objects.filter(
-                memberships__user=self.request.user,
-                memberships__status=TripStatus.ACTIVE,
-            )
-            .select_related("created_by")
-            .distinct()
+        memberships = TripMember.objects.filter(
+            trip=OuterRef("pk"),
+            user=self.request.user,
+            status=TripStatus.ACTIVE,
+        )
+        queryset = Trip.objects.filter(Exists(memberships)).select_related("created_by")
+        if self._include_counts():
+            queryset = _annotate_trip_counts(queryset, self.request.user)
+        return queryset
+
+    def get_serializer_class(self):
+        if self._include_counts():
+            return TripCountsSerializer
+        return TripSerializer
+
+    def get_object(self):
+        trip, member = fetch_trip_object(
+            self.request.user,
+            Trip.objects.select_related("created_by"),
+            trip_path=None,
+            request=self.request,
+            pk=self.kwargs[self.lookup_field],
         )
+        if trip is None or member is None:
+            raise Http404
+        self.check_object_permissions(self.request, trip)
+        return trip
+
+    def perform_update(self, serializer):
+        previous_currency = serializer.instance.base_currency
+        with transaction.atomic():
+            trip = serializer.save()
+            if trip.base_currency != previous_currency:
+                reconvert_trip_expenses(trip)
 
     def perform_create(self, serializer):
         with transaction.atomic():
@@ -93,26 +205,368 @@ def _hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 
-def _get_trip_or_404(trip_id):
-    return get_object_or_404(Trip, id=trip_id)
+def _get_trip_for_member(request, trip_id):
+    return resolve_trip_object(
+        request.user, Trip.objects.all(), trip_path=None, request=request, pk=trip_id
+    )
+
+
+def _get_for_member(request, queryset, **lookup):
+    return resolve_trip_object(request.user, queryset, request=request, **lookup)
+
+
+def _active_members(trip):
+    return (
+        TripMember.objects.filter(trip=trip, status=TripStatus.ACTIVE)
+        .select_related("user")
+        .order_by("created_at")
+    )
+
+
+def _itinerary_items(trip):
+    return ItineraryItem.objects.filter(trip=trip).order_by("rank")
+
+
+def _parse_item_fields(request):
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    fields = {value.strip() for value in raw.split(",") if value.strip()}
+    unknown = fields - set(ItineraryItemSerializer.Meta.fields)
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return fields | {"id"}
+
+
+def _parse_date_param(request, name):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    value = parse_date(raw)
+    if value is None:
+        raise ValidationError(f"{name} must be a YYYY-MM-DD date.")
+    return value
+
+
+def _windowed_itinerary(request, trip, fields):
+    items = _itinerary_items(trip)
+    if fields is not None and "notes" not in fields:
+        items = items.defer("notes")
+    date_from = _parse_date_param(request, "from")
+    date_to = _parse_date_param(request, "to")
+    if date_from is None and date_to is None:
+        return items
+    # Both bounds are inclusive; the (trip, date) index serves the range and the day order.
+    if date_from is not None:
+        items = items.filter(date__gte=date_from)
+    if date_to is not None:
+        items = items.filter(date__lte=date_to)
+    return items.order_by("date", "rank")
+
+
+CONFLICT_FIELDS = ("id", "title", "date", "start_time", "end_time")
+
+
+def _itinerary_conflicts(trip, date=None):
+    rows = ItineraryItem.objects.filter(trip=trip, date__isnull=False, start_time__isnull=False)
+    if date is not None:
+        rows = rows.filter(date=date)
+    return find_conflicts(rows.order_by("date", "start_time").values(*CONFLICT_FIELDS))
+
+
+def _item_conflicts(item):
+    if item.date is None or item.start_time is None:
+        return []
+    clashes = []
+    for _, first, second in _itinerary_conflicts(item.trip_id, item.date):
+        if first["id"] == item.id:
+            clashes.append(second)
+        elif second["id"] == item.id:
+            clashes.append(first)
+    return clashes
+
+
+def _wants_conflicts(request):
+    return request.query_params.get("check_conflicts") in ("1", "true")
+
+
+def _polls_for_user(trip, user):
+    options_qs = PollOption.objects.annotate(vote_count=Count("votes"))
+    return (
+        Poll.objects.filter(trip=trip)
+        .prefetch_related(
+            Prefetch("options", queryset=options_qs),
+            Prefetch(
+                "votes",
+                queryset=Vote.objects.filter(user=user),
+                to_attr="user_votes",
+            ),
+        )
+        .order_by("-created_at")
+    )
+
+
+def _recent_messages(trip, limit, before=None):
+    window = ChatMessage.objects.filter(trip=trip)
+    if before:
+        window = window.filter(created_at__lt=before)
+    window = window.order_by("-created_at").values("id")[:limit]
+    return (
+        ChatMessage.objects.filter(id__in=Subquery(window))
+        .select_related("sender")
+        .order_by("created_at")
+    )
 
 
-def _require_member(request, trip):
-    member = get_trip_member(request.user, trip)
-    if member is None:
-        raise PermissionDenied("Not a trip member.")
-    return member
+def _side_loaded_users(expenses):
+    from django.contrib.auth import get_user_model
 
+    User = get_user_model()
+    user_ids = set()
+    for expense in expenses:
+        user_ids.add(expense.paid_by_id)
+        user_ids.add(expense.created_by_id)
+        user_ids.update(split.user_id for split in expense.splits.all())
+    users = User.objects.filter(id__in=user_ids).only("id", "email", "name")
+    return {str(user.id): MemberUserSerializer(user).data for user in users}
+
+
+def _parse_range_param(request, name, end_of_day=False):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError(f"{name} must be an ISO 8601 date or datetime.")
+        value = datetime.combine(day, datetime.min.time())
+        if end_of_day:
+            value += timedelta(days=1)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+def _parse_uuid_param(request, name):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    try:
+        return uuid.UUID(raw)
+    except ValueError:
+        raise ValidationError(f"{name} must be a UUID.") from None
+
+
+def _filter_expenses(request, queryset):
+    paid_by = _parse_uuid_param(request, "paid_by")
+    if paid_by:
+        queryset = queryset.filter(paid_by_id=paid_by)
+    participant = _parse_uuid_param(request, "participant")
+    if participant:
+        queryset = queryset.filter(
+            Exists(ExpenseSplit.objects.filter(expense=OuterRef("pk"), user_id=participant))
+        )
+    currency = request.query_params.get("currency")
+    if currency:
+        queryset = queryset.filter(currency=currency.upper())
+    created_from = _parse_range_param(request, "from")
+    if created_from:
+        queryset = queryset.filter(created_at__gte=created_from)
+    # `to` is exclusive; a bare date is read as the end of that day.
+    created_to = _parse_range_param(request, "to", end_of_day=True)
+    if created_to:
+        queryset = queryset.filter(created_at__lt=created_to)
+    return queryset
+
+
+def _active_member_ids(trip):
+    return set(
+        TripMember.objects.filter(trip=trip, status=TripStatus.ACTIVE).values_list(
+            "user_id", flat=True
+        )
+    )
 
-def _require_member_for_user(user, trip):
-    member = TripMember.objects.filter(
+
+def _build_splits(expense, split_type, splits_data, participant_ids):
+    if splits_data:
+        participant_ids = [split["user_id"] for split in splits_data]
+    if split_type == SplitType.EQUAL:
+        amounts = split_amount(
+            expense.amount, expense.currency, split_type, count=len(participant_ids)
+        )
+    else:
+        field = SPLIT_VALUE_FIELDS[split_type]
+        values = [split[field] for split in splits_data]
+        amounts = split_amount(expense.amount, expense.currency, split_type, values)
+    return [
+        ExpenseSplit(expense=expense, user_id=user_id, amount=share)
+        for user_id, share in zip(participant_ids, amounts, strict=True)
+    ]
+
+
+def _build_expense(trip, data, member_ids, user):
+    """Validate ``ExpenseCreateSerializer`` data and return an unsaved expense and its splits."""
+    paid_by_id = data.get("paid_by") or user.id
+    participant_ids = data.get("participant_ids")
+    splits_data = data.get("splits")
+
+    if splits_data:
+        participant_ids = [split["user_id"] for split in splits_data]
+
+    if participant_ids:
+        missing = [pid for pid in participant_ids if pid not in member_ids]
+        if missing:
+            raise ValidationError("Participants must be trip members.")
+    else:
+        participant_ids = list(member_ids)
+
+    if paid_by_id not in member_ids:
+        raise ValidationError("paid_by must be a trip member.")
+
+    expense = Expense(
         trip=trip,
-        user=user,
-        status=TripStatus.ACTIVE,
-    ).first()
-    if member is None:
-        raise PermissionDenied("Not a trip member.")
-    return member
+        title=data["title"],
+        category=data.get("category", ""),
+        amount=data["amount"],
+        currency=(data.get("currency") or trip.base_currency).upper(),
+        paid_by_id=paid_by_id,
+        created_by=user,
+    )
+    splits = _build_splits(expense, data["split_type"], splits_data, participant_ids)
+    convert_expense(expense, splits, trip.base_currency)
+    return expense, splits
+
+
+def _write_split_changes(existing_splits, previous, splits):
+    """Persist only the split rows that differ from ``previous`` (user_id -> (amount, base)).
+
+    ``splits`` may reuse the ``existing_splits`` instances. Returns whether anything was written.
+    """
+    existing = {split.user_id: split for split in existing_splits}
+    to_create = []
+    to_update = []
+    for split in splits:
+        current = existing.pop(split.user_id, None)
+        if current is None:
+            to_create.append(split)
+        elif previous[split.user_id] != (split.amount, split.base_amount):
+            current.amount = split.amount
+            current.base_amount = split.base_amount
+            to_update.append(current)
+
+    if existing:
+        ExpenseSplit.objects.filter(id__in=[split.id for split in existing.values()]).delete()
+    if to_update:
+        ExpenseSplit.objects.bulk_update(to_update, ["amount", "base_amount"])
+    if to_create:
+        ExpenseSplit.objects.bulk_create(to_create)
+    return bool(existing or to_update or to_create)
+
+
+def _expense_summary(trip, members):
+    totals = {
+        user_id: (paid, owed)
+        for user_id, paid, owed in TripMemberBalance.objects.filter(trip=trip)
+        .values_list("user_id")
+        .annotate(paid=Sum("base_paid"), owed=Sum("base_owed"))
+        .order_by()
+    }
+
+    summary = []
+    for member in members:
+        paid, owed = totals.get(member.user_id, (Decimal("0.00"), Decimal("0.00")))
+        net = paid - owed
+        summary.append(
+            {
+                "user": {
+                    "id": member.user_id,
+                    "email": member.user.email,
+                    "name": member.user.name or "",
+                },
+                "paid": paid,
+                "owed": owed,
+                "net": net,
+                "currency": trip.base_currency,
+            }
+        )
+    return summary
+
+
+def _my_balances(user):
+    """Per-trip and per-counterparty totals for ``user`` across their active trips.
+
+    One grouped query over the splits the user paid for or owes. Each group is keyed by the other
+    party (the split's user when ``user`` paid, the payer otherwise), so the same rows give both
+    the per-trip paid/owed and the rollup of what each counterparty owes ``user``.
+    """
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    mine = Q(expense__paid_by=user)
+    owes = Q(user=user)
+    rows = (
+        ExpenseSplit.objects.filter(mine | owes)
+        .filter(
+            Exists(
+                TripMember.objects.filter(
+                    trip_id=OuterRef("expense__trip_id"), user=user, status=TripStatus.ACTIVE
+                )
+            )
+        )
+        .values_list("expense__trip_id", "expense__trip__title", "expense__trip__base_currency")
+        .annotate(
+            counterparty=Case(When(mine, then=F("user_id")), default=F("expense__paid_by_id")),
+            paid=Coalesce(Sum("base_amount", filter=mine), Decimal("0.00")),
+            owed=Coalesce(Sum("base_amount", filter=owes), Decimal("0.00")),
+        )
+        .order_by()
+    )
+
+    trips = {}
+    counterparties = {}
+    for trip_id, title, currency, counterparty, paid, owed in rows:
+        totals = trips.setdefault(
+            trip_id,
+            {
+                "trip": {"id": trip_id, "title": title},
+                "paid": Decimal("0.00"),
+                "owed": Decimal("0.00"),
+                "currency": currency,
+            },
+        )
+        totals["paid"] += paid
+        totals["owed"] += owed
+        if counterparty != user.id:
+            key = (counterparty, currency)
+            counterparties[key] = counterparties.get(key, Decimal("0.00")) + paid - owed
+
+    for totals in trips.values():
+        totals["net"] = totals["paid"] - totals["owed"]
+    users = User.objects.in_bulk({user_id for user_id, _ in counterparties})
+    return {
+        "trips": sorted(
+            trips.values(), key=lambda row: (row["trip"]["title"], str(row["trip"]["id"]))
+        ),
+        "counterparties": [
+            {"user": users[user_id], "net": net, "currency": currency}
+            for (user_id, currency), net in sorted(
+                counterparties.items(), key=lambda item: (-abs(item[1]), str(item[0][0]))
+            )
+            if net
+        ],
+    }
+
+
+def _not_modified(etag):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    return _with_etag(response, etag)
+
+
+def _with_etag(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
 
 
 def _get_user_from_token(token):
@@ -135,23 +589,126 @@ class TripMembersView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
-        members = (
-            TripMember.objects.filter(trip=trip, status=TripStatus.ACTIVE)
-            .select_related("user")
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.MEMBER])
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        serializer = TripMemberSerializer(_active_members(trip), many=True)
+        return _with_etag(Response(serializer.data), etag)
+
+
+class TripDashboardView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    sections = ("trip", "itinerary", "members", "polls", "expense_summary", "chat")
+
+    def _parse_sections(self, request):
+        def _split(name):
+            raw = request.query_params.get(name)
+            if raw is None:
+                return None
+            values = {value.strip() for value in raw.split(",") if value.strip()}
+            unknown = values - set(self.sections)
+            if unknown:
+                raise ValidationError(f"Unknown sections: {', '.join(sorted(unknown))}.")
+            return values
+
+        included = _split("include")
+        excluded = _split("exclude") or set()
+        selected = set(self.sections) if included is None else included
+        return selected - excluded
+
+    def get(self, request, trip_id):
+        trip, member = _get_trip_for_member(request, trip_id)
+        sections = self._parse_sections(request)
+
+        limit_raw = request.query_params.get("chat_limit", "20")
+        try:
+            chat_limit = min(int(limit_raw), 200)
+        except ValueError:
+            raise ValidationError("chat_limit must be an integer.") from None
+        if chat_limit < 0:
+            raise ValidationError("chat_limit must not be negative.")
+
+        payload = {"role": member.role}
+        if "trip" in sections:
+            payload["trip"] = TripSerializer(trip).data
+        if "itinerary" in sections:
+            payload["itinerary"] = ItineraryItemSerializer(_itinerary_items(trip), many=True).data
+        members = None
+        if "members" in sections or "expense_summary" in sections:
+            members = list(_active_members(trip))
+        if "members" in sections:
+            payload["members"] = TripMemberSerializer(members, many=True).data
+        if "polls" in sections:
+            payload["polls"] = PollSerializer(
+                _polls_for_user(trip, request.user), many=True, context={"request": request}
+            ).data
+        if "expense_summary" in sections:
+            payload["expense_summary"] = ExpenseSummarySerializer(
+                _expense_summary(trip, members), many=True
+            ).data
+        if "chat" in sections:
+            payload["chat"] = ChatMessageSerializer(
+                _recent_messages(trip, chat_limit), many=True
+            ).data
+        return Response(payload)
+
+
+class TripChangesView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _serialize(self, request, trip, entity, ids):
+        if entity == TripEntity.TRIP:
+            return [TripSerializer(trip).data]
+        if entity == TripEntity.MEMBER:
+            return TripMemberSerializer(_active_members(trip).filter(id__in=ids), many=True).data
+        if entity == TripEntity.ITINERARY:
+            items = _itinerary_items(trip).filter(id__in=ids)
+            return ItineraryItemSerializer(items, many=True).data
+        if entity == TripEntity.EXPENSE:
+            expenses = (
+                Expense.objects.filter(trip=trip, id__in=ids)
+                .select_related("paid_by", "created_by")
+                .prefetch_related("splits__user")
+            )
+            return ExpenseSerializer(expenses, many=True).data
+        if entity == TripEntity.POLL:
+            polls = _polls_for_user(trip, request.user).filter(id__in=ids)
+            return PollSerializer(polls, many=True, context={"request": request}).data
+        messages = (
+            ChatMessage.objects.filter(trip=trip, id__in=ids)
+            .select_related("sender")
             .order_by("created_at")
         )
-        serializer = TripMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        return ChatMessageSerializer(messages, many=True).data
+
+    def get(self, request, trip_id):
+        trip, _ = _get_trip_for_member(request, trip_id)
+        try:
+            since = int(request.query_params.get("since", "0"))
+        except ValueError:
+            raise ValidationError("since must be an integer.") from None
+
+        revision, upserts, deleted = changes_since(trip, since)
+        return Response(
+            {
+                "revision": revision,
+                "changes": {
+                    entity: self._serialize(request, trip, entity, ids)
+                    for entity, ids in upserts.items()
+                },
+                "deleted": {
+                    entity: [str(object_id) for object_id in ids] for entity, ids in deleted.items()
+                },
+            }
+        )
 
 
 class TripUserSearchView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_owner(member):
             raise PermissionDenied("Only owners can search users.")
 
@@ -184,8 +741,7 @@ class TripChatKeyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
+        trip, _ = _get_trip_for_member(request, trip_id)
 
         chat_key, _ = TripChatKey.objects.get_or_create(
             trip=trip,
@@ -194,18 +750,30 @@ class TripChatKeyView(APIView):
         return Response({"key": chat_key.key, "version": chat_key.version})
 
 
-class TripChatMessagesView(APIView):
+def _broadcast_chat_message(trip_id, payload):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            f"trip_{trip_id}",
+            {"type": "chat.message", "message": payload},
+        )
+    except Exception:  # pragma: no cover - best-effort broadcast
+        logger.exception("chat broadcast failed", extra={"trip_id": str(trip_id)})
+
+
+class TripChatMessagesView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
+        trip, _ = _get_trip_for_member(request, trip_id)
 
         limit_raw = request.query_params.get("limit", "50")
         try:
             limit = min(int(limit_raw), 200)
         except ValueError:
-            raise ValidationError("limit must be an integer.")
+            raise ValidationError("limit must be an integer.") from None
 
         before = request.query_params.get("before")
         before_dt = None
@@ -216,23 +784,23 @@ class TripChatMessagesView(APIView):
             if timezone.is_naive(before_dt):
                 before_dt = timezone.make_aware(before_dt, timezone.get_current_timezone())
 
-        queryset = (
-            ChatMessage.objects.filter(trip=trip)
-            .select_related("sender")
-            .order_by("-created_at")
-        )
-        if before_dt:
-            queryset = queryset.filter(created_at__lt=before_dt)
+        if before_dt is None:
+            latest = Subquery(
+                ChatMessage.objects.filter(trip=trip)
+                .order_by("-created_at")
+                .values("created_at")[:1]
+            )
+            TripMember.objects.filter(trip=trip, user=request.user).filter(
+                Q(last_read_at__isnull=True) | Q(last_read_at__lt=latest)
+            ).update(last_read_at=latest)
 
-        messages = list(queryset[:limit])
-        messages.reverse()
+        messages = _recent_messages(trip, limit, before=before_dt)
+        if wants_stream(request):
+            return stream_queryset(messages, ChatMessageSerializer())
         return Response(ChatMessageSerializer(messages, many=True).data)
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
-        if not member:
-            raise PermissionDenied("Not a trip member.")
+        trip, member = _get_trip_for_member(request, trip_id)
 
         content = (request.data.get("content") or "").strip()
         encrypted_content = (request.data.get("encrypted_content") or "").strip()
@@ -247,7 +815,7 @@ class TripChatMessagesView(APIView):
                 try:
                     encryption_version = int(encryption_version)
                 except (TypeError, ValueError):
-                    raise ValidationError("encryption_version must be an integer.")
+                    raise ValidationError("encryption_version must be an integer.") from None
         else:
             encryption_version = None
 
@@ -272,19 +840,28 @@ class TripChatMessagesView(APIView):
         message = ChatMessage.objects.select_related("sender").get(id=message.id)
 
         payload = ChatMessageSerializer(message).data
-        channel_layer = get_channel_layer()
-        if channel_layer is not None:
-            try:
-                async_to_sync(channel_layer.group_send)(
-                    f"trip_{trip_id}",
-                    {"type": "chat.message", "message": payload},
-                )
-            except Exception:  # pragma: no cover - best-effort broadcast
-                logger.exception("chat broadcast failed", extra={"trip_id": str(trip_id)})
-
+        # Broadcast once the message is committed, not while the request still holds its locks.
+        transaction.on_commit(lambda: _broadcast_chat_message(trip_id, payload))
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
+CALENDAR_CACHE_TIMEOUT = 60 * 60
+
+
+def _calendar_not_modified(request, etag, last_modified):
+    if request.META.get("HTTP_IF_NONE_MATCH"):
+        return etag_matches(request, etag)
+    since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return since is not None and int(last_modified.timestamp()) <= since
+
+
+def _with_calendar_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
 class TripCalendarExportView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -297,77 +874,80 @@ class TripCalendarExportView(APIView):
                 raise PermissionDenied("Authentication required.")
             user = user_from_token
 
-        trip = _get_trip_or_404(trip_id)
-        _require_member_for_user(user, trip)
+        trip, _ = resolve_trip_object(user, Trip.objects.all(), trip_path=None, pk=trip_id)
 
-        items = (
-            ItineraryItem.objects.filter(trip=trip)
-            .order_by("date", "start_time", "sort_order")
-            .all()
+        changes = TripChange.objects.filter(trip=trip, entity=TripEntity.ITINERARY).aggregate(
+            revision=Max("revision"), changed_at=Max("changed_at")
         )
-        now = timezone.now()
-        lines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Smart Trip Planner//EN",
-            "CALSCALE:GREGORIAN",
-        ]
-
-        for item in items:
-            if item.date is None:
-                continue
-            uid = f"{item.id}@smart-trip-planner"
-            lines.append("BEGIN:VEVENT")
-            lines.append(f"UID:{uid}")
-            lines.append(f"DTSTAMP:{now.strftime('%Y%m%dT%H%M%SZ')}")
-            if item.start_time or item.end_time:
-                start_time = item.start_time or item.end_time
-                end_time = item.end_time or item.start_time
-                start_dt = timezone.make_aware(
-                    datetime.combine(item.date, start_time),
-                    timezone=timezone.get_current_timezone(),
-                )
-                end_dt = timezone.make_aware(
-                    datetime.combine(item.date, end_time),
-                    timezone=timezone.get_current_timezone(),
-                )
-                lines.append(f"DTSTART:{start_dt.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')}")
-                lines.append(f"DTEND:{end_dt.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')}")
-            else:
-                lines.append(f"DTSTART;VALUE=DATE:{item.date.strftime('%Y%m%d')}")
-
-            summary = item.title.replace("\n", " ").strip()
-            lines.append(f"SUMMARY:{summary}")
-            if item.location:
-                lines.append(f"LOCATION:{item.location.replace('\n', ' ').replace('\r', ' ').strip()}")
-            if item.notes:
-                lines.append(f"DESCRIPTION:{item.notes.replace('\n', ' ').replace('\r', ' ').strip()}")
-            lines.append("END:VEVENT")
-
-        lines.append("END:VCALENDAR")
-        content = "\r\n".join(lines)
-        response = HttpResponse(content, content_type="text/calendar; charset=utf-8")
+        revision = changes["revision"] or 0
+        last_modified = changes["changed_at"] or trip.created_at
+        tz_name = timezone.get_current_timezone_name()
+        digest = hashlib.sha256(f"{trip.id}|{revision}|{tz_name}".encode()).hexdigest()
+        etag = f'"{digest[:32]}"'
+        if _calendar_not_modified(request, etag, last_modified):
+            return _with_calendar_headers(HttpResponse(status=304), etag, last_modified)
+
+        cache_key = f"trip_calendar:{trip.id}:{revision}:{tz_name}"
+        body = cache.get(cache_key)
+        if body is None:
+            # Rendered once per itinerary revision; the cached bytes are the only full copy.
+            rows = (
+                ItineraryItem.objects.filter(trip=trip, date__isnull=False)
+                .order_by("date", "start_time", "rank")
+                .values_list(*EVENT_COLUMNS)
+                .iterator(chunk_size=500)
+            )
+            body = b"".join(iter_calendar(rows, timezone.get_current_timezone()))
+            cache.set(cache_key, body, timeout=CALENDAR_CACHE_TIMEOUT)
+        response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
         response["Content-Disposition"] = f'attachment; filename="trip-{trip_id}.ics"'
-        return response
+        return _with_calendar_headers(response, etag, last_modified)
 
 
-class TripExpensesView(APIView):
+class TripExpensesView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
-        expenses = (
-            Expense.objects.filter(trip=trip)
-            .select_related("paid_by", "created_by")
-            .prefetch_related("splits__user")
-            .order_by("-created_at")
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.EXPENSE])
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        expenses = _filter_expenses(request, Expense.objects.filter(trip=trip)).order_by(
+            "-created_at", "-id"
         )
-        return Response(ExpenseSerializer(expenses, many=True).data)
+        normalized = request.query_params.get("shape") == "normalized"
+        if normalized:
+            splits = ExpenseSplit.objects.only(
+                "id", "expense_id", "user_id", "amount", "base_amount"
+            )
+            expenses = expenses.prefetch_related(Prefetch("splits", queryset=splits))
+            serializer_class = NormalizedExpenseSerializer
+        else:
+            expenses = expenses.select_related("paid_by", "created_by").prefetch_related(
+                "splits__user"
+            )
+            serializer_class = ExpenseSerializer
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(expenses, request, view=self)
+        if page is not None:
+            response = paginator.get_paginated_response(serializer_class(page, many=True).data)
+            if normalized:
+                response.data["users"] = _side_loaded_users(page)
+            return _with_etag(response, etag)
+        if normalized:
+            expenses = list(expenses)
+            payload = {
+                "expenses": serializer_class(expenses, many=True).data,
+                "users": _side_loaded_users(expenses),
+            }
+            return _with_etag(Response(payload), etag)
+        if wants_stream(request):
+            return _with_etag(stream_queryset(expenses, ExpenseSerializer()), etag)
+        return _with_etag(Response(ExpenseSerializer(expenses, many=True).data), etag)
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
@@ -375,80 +955,335 @@ class TripExpensesView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
-        amount = data["amount"]
-        currency = data.get("currency") or "USD"
-        paid_by_id = data.get("paid_by") or request.user.id
+        expense, splits = _build_expense(trip, data, _active_member_ids(trip), request.user)
+        with transaction.atomic():
+            expense.save()
+            ExpenseSplit.objects.bulk_create(splits)
+            apply_deltas(trip.id, expense_deltas(expense, splits))
 
-        participant_ids = data.get("participant_ids")
-        splits_data = data.get("splits")
+        expense = (
+            Expense.objects.filter(id=expense.id)
+            .select_related("paid_by", "created_by")
+            .prefetch_related("splits__user")
+            .get()
+        )
+        return Response(ExpenseSerializer(expense).data, status=status.HTTP_201_CREATED)
 
-        if splits_data:
-            participant_ids = [split["user_id"] for split in splits_data]
 
-        members = TripMember.objects.filter(
-            trip=trip,
-            status=TripStatus.ACTIVE,
-        ).select_related("user")
+EXPORT_COLUMNS = (
+    "expense_id",
+    "created_at",
+    "title",
+    "category",
+    "currency",
+    "amount",
+    "base_currency",
+    "base_amount",
+    "paid_by_id",
+    "paid_by_email",
+    "split_user_id",
+    "split_user_email",
+    "split_amount",
+    "split_base_amount",
+)
 
-        member_ids = {member.user_id for member in members}
-        if participant_ids:
-            missing = [pid for pid in participant_ids if pid not in member_ids]
-            if missing:
-                raise ValidationError("Participants must be trip members.")
-        else:
-            participant_ids = list(member_ids)
 
-        if paid_by_id not in member_ids:
-            raise ValidationError("paid_by must be a trip member.")
+def _export_rows(trip):
+    rows = (
+        ExpenseSplit.objects.filter(expense__trip=trip)
+        .order_by("expense__created_at", "expense_id", "id")
+        .values_list(
+            "expense_id",
+            "expense__created_at",
+            "expense__title",
+            "expense__category",
+            "expense__currency",
+            "expense__amount",
+            "expense__base_amount",
+            "expense__paid_by_id",
+            "expense__paid_by__email",
+            "user_id",
+            "user__email",
+            "amount",
+            "base_amount",
+        )
+    )
+    # iterator() streams from a server-side cursor on PostgreSQL.
+    for row in rows.iterator(chunk_size=2000):
+        yield row[:6] + (trip.base_currency,) + row[6:]
+
+
+def _csv_export(trip):
+    for row in _export_rows(trip):
+        yield [value.isoformat() if isinstance(value, datetime) else value for value in row]
+
+
+def _ndjson_export(trip):
+    records = (dict(zip(EXPORT_COLUMNS, row, strict=True)) for row in _export_rows(trip))
+    for expense_id, group in groupby(records, key=itemgetter("expense_id")):
+        group = list(group)
+        first = group[0]
+        yield {
+            "id": str(expense_id),
+            "created_at": first["created_at"].isoformat(),
+            "title": first["title"],
+            "category": first["category"],
+            "currency": first["currency"],
+            "amount": str(first["amount"]),
+            "base_currency": first["base_currency"],
+            "base_amount": str(first["base_amount"]),
+            "paid_by": {"id": str(first["paid_by_id"]), "email": first["paid_by_email"]},
+            "splits": [
+                {
+                    "user": {"id": str(row["split_user_id"]), "email": row["split_user_email"]},
+                    "amount": str(row["split_amount"]),
+                    "base_amount": str(row["split_base_amount"]),
+                }
+                for row in group
+            ],
+        }
 
-        with transaction.atomic():
-            expense = Expense.objects.create(
-                trip=trip,
-                title=data["title"],
-                amount=amount,
-                currency=currency,
-                paid_by_id=paid_by_id,
-                created_by=request.user,
+
+ANALYTICS_CACHE_TIMEOUT = 60 * 60
+
+
+def _expense_analytics(trip):
+    rows = (
+        Expense.objects.filter(trip=trip)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("day", "paid_by_id", "paid_by__email", "paid_by__name", "currency", "category")
+        .annotate(amount=Sum("amount"), base_amount=Sum("base_amount"), count=Count("id"))
+        .order_by()
+    )
+
+    zero = Decimal("0.00")
+    total = zero
+    by_day = {}
+    by_payer = {}
+    by_currency = {}
+    by_category = {}
+    for day, user_id, email, name, currency, category, amount, base_amount, count in rows:
+        total += base_amount
+        by_day[day] = by_day.get(day, zero) + base_amount
+        payer = by_payer.setdefault(
+            user_id, {"user": {"id": str(user_id), "email": email, "name": name}, "total": zero}
+        )
+        payer["total"] += base_amount
+        totals = by_currency.setdefault(currency, [zero, zero, 0])
+        totals[0] += amount
+        totals[1] += base_amount
+        totals[2] += count
+        by_category[category] = by_category.get(category, zero) + base_amount
+
+    def money(value):
+        return f"{value:.2f}"
+
+    return {
+        "currency": trip.base_currency,
+        "total": money(total),
+        "by_day": [
+            {"date": day.isoformat(), "total": money(value)}
+            for day, value in sorted(by_day.items())
+        ],
+        "by_payer": [
+            {**payer, "total": money(payer["total"])}
+            for payer in sorted(by_payer.values(), key=lambda payer: -payer["total"])
+        ],
+        "by_currency": [
+            {
+                "currency": currency,
+                "amount": money(amount),
+                "base_amount": money(base_amount),
+                "count": count,
+            }
+            for currency, (amount, base_amount, count) in sorted(by_currency.items())
+        ],
+        "by_category": [
+            {"category": category, "total": money(value)}
+            for category, value in sorted(by_category.items())
+        ],
+    }
+
+
+class TripExpenseAnalyticsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, trip_id):
+        trip, _ = _get_trip_for_member(request, trip_id)
+        revision = collection_revision(trip.id, [TripEntity.EXPENSE])
+        # Rebasing a trip bumps the expense revision, but only when it has expenses.
+        cache_key = f"trip_expense_analytics:{trip.id}:{revision}:{trip.base_currency}"
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = _expense_analytics(trip)
+            cache.set(cache_key, payload, timeout=ANALYTICS_CACHE_TIMEOUT)
+        return Response(payload)
+
+
+class TripExpenseTimelineView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, trip_id):
+        from django.contrib.auth import get_user_model
+
+        User = get_user_model()
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.TRIP, TripEntity.EXPENSE])
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+
+        user_ids, points = balance_timeline(trip.id)
+        users = User.objects.filter(id__in=user_ids).only("id", "email", "name").in_bulk()
+        # Nets change for a few members per expense, so reuse the formatted strings of the rest.
+        formatted = {}
+        timeline = []
+        for expense_id, created_at, nets in points:
+            timeline.append(
+                {
+                    "expense_id": expense_id,
+                    "created_at": created_at,
+                    "nets": [
+                        formatted.get(cents) or formatted.setdefault(cents, str(from_cents(cents)))
+                        for cents in nets
+                    ],
+                }
             )
+        payload = {
+            "currency": trip.base_currency,
+            "members": [MemberUserSerializer(users[user_id]).data for user_id in user_ids],
+            "timeline": timeline,
+        }
+        return _with_etag(Response(payload), etag)
 
-            if splits_data:
-                total_split = sum((split["amount"] for split in splits_data), Decimal("0"))
-                if total_split != amount:
-                    raise ValidationError("Split amounts must equal total amount.")
-                splits = [
-                    ExpenseSplit(expense=expense, user_id=split["user_id"], amount=split["amount"])
-                    for split in splits_data
-                ]
-            else:
-                count = len(participant_ids)
-                if count == 0:
-                    raise ValidationError("Participants required.")
-                quant = Decimal("0.01")
-                share = (amount / count).quantize(quant, rounding=ROUND_HALF_UP)
-                splits = []
-                for idx, user_id in enumerate(participant_ids):
-                    split_amount = share
-                    if idx == count - 1:
-                        split_amount = amount - share * (count - 1)
-                    splits.append(ExpenseSplit(expense=expense, user_id=user_id, amount=split_amount))
 
-            ExpenseSplit.objects.bulk_create(splits)
+class TripExpenseExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
 
-        expense = (
-            Expense.objects.filter(id=expense.id)
-            .select_related("paid_by", "created_by")
-            .prefetch_related("splits__user")
-            .get()
+    def perform_content_negotiation(self, request, force=False):
+        # `format` picks the export type here, not a DRF renderer.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, trip_id):
+        trip, _ = _get_trip_for_member(request, trip_id)
+        export_format = request.query_params.get("format", "csv")
+        if export_format == "csv":
+            content = iter_csv(EXPORT_COLUMNS, _csv_export(trip))
+            content_type = "text/csv; charset=utf-8"
+        elif export_format == "ndjson":
+            content = iter_ndjson(_ndjson_export(trip))
+            content_type = "application/x-ndjson"
+        else:
+            raise ValidationError("format must be csv or ndjson.")
+        response = ChunkedStreamingResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="trip-{trip_id}-expenses.{export_format}"'
         )
-        return Response(ExpenseSerializer(expense).data, status=status.HTTP_201_CREATED)
+        return response
+
 
+def _parse_id_list(value):
+    return [item.strip() for item in value.split(";") if item.strip()]
 
-class ExpenseDetailView(APIView):
+
+def _csv_expense_row(row):
+    data = {key: value for key, value in row.items() if key and value not in (None, "")}
+    if "participant_ids" in data:
+        data["participant_ids"] = _parse_id_list(data["participant_ids"])
+    if "splits" in data:
+        # "<user_id>=<value>;..." where value is the amount, weight or percentage for split_type.
+        field = SPLIT_VALUE_FIELDS.get(data.get("split_type"), "amount")
+        data["splits"] = [
+            dict(zip(("user_id", field), item.split("=", 1), strict=False))
+            for item in _parse_id_list(data["splits"])
+        ]
+    return data
+
+
+def _csv_expense_rows(upload):
+    reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+    try:
+        for row in reader:
+            yield _csv_expense_row(row)
+    except UnicodeDecodeError:
+        raise ValidationError("The CSV file must be UTF-8 encoded.") from None
+    except csv.Error as exc:
+        raise ValidationError(f"Could not parse the CSV file: {exc}.") from None
+
+
+def _bulk_expense_rows(request):
+    upload = request.FILES.get("file")
+    if upload is not None:
+        return _csv_expense_rows(upload)
+    rows = request.data
+    if isinstance(rows, dict):
+        rows = rows.get("expenses")
+    if not isinstance(rows, list):
+        raise ValidationError("Send a JSON list of expenses or a CSV file.")
+    return rows
+
+
+class TripExpenseBulkView(DeferredChangesMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser]
+    max_rows = 1000
+
+    def post(self, request, trip_id):
+        trip, member = _get_trip_for_member(request, trip_id)
+        if not is_editor_or_owner(member):
+            raise PermissionDenied("Insufficient permissions.")
+        partial = request.query_params.get("partial") in ("1", "true")
+
+        member_ids = _active_member_ids(trip)
+        built = []
+        errors = []
+        for index, row in enumerate(_bulk_expense_rows(request)):
+            if index >= self.max_rows:
+                raise ValidationError(f"At most {self.max_rows} expenses per request.")
+            serializer = ExpenseCreateSerializer(data=row)
+            try:
+                serializer.is_valid(raise_exception=True)
+                built.append(
+                    _build_expense(trip, serializer.validated_data, member_ids, request.user)
+                )
+            except ValidationError as exc:
+                errors.append({"row": index, "errors": exc.detail})
+
+        if errors and not partial:
+            return Response({"created": 0, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        expenses = [expense for expense, _ in built]
+        splits = [split for _, expense_splits in built for split in expense_splits]
+        if expenses:
+            deltas = None
+            for expense, expense_splits in built:
+                deltas = expense_deltas(expense, expense_splits, deltas=deltas)
+            with transaction.atomic():
+                Expense.objects.bulk_create(expenses, batch_size=500)
+                ExpenseSplit.objects.bulk_create(splits, batch_size=1000)
+                apply_deltas(trip.id, deltas)
+                # bulk_create skips post_save, so the sync log is written here.
+                record_changes(trip.id, TripEntity.EXPENSE, [expense.id for expense in expenses])
+
+        payload = {
+            "created": len(expenses),
+            "ids": [expense.id for expense in expenses],
+            "errors": errors,
+        }
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+
+def _locked_expenses():
+    # Writers hold the expense row until the request's transaction ends, so two edits of the same
+    # expense cannot both read its old splits and apply their ledger deltas on top of each other.
+    # Only the expense is locked: the caller's membership comes in through an outer join.
+    return Expense.objects.select_for_update(of=("self",))
+
+
+class ExpenseDetailView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def patch(self, request, expense_id):
-        expense = get_object_or_404(Expense, id=expense_id)
-        member = _require_member(request, expense.trip)
+        expense, member = _get_for_member(request, _locked_expenses(), id=expense_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
@@ -456,11 +1291,11 @@ class ExpenseDetailView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
-        amount = data.get("amount", expense.amount)
-        currency = data.get("currency", expense.currency)
-        title = data.get("title", expense.title)
-        if "title" in data and not title.strip():
+        title = data.get("title", expense.title).strip()
+        if "title" in data and not title:
             raise ValidationError("Title is required.")
+        amount = data.get("amount", expense.amount)
+        currency = (data.get("currency") or expense.currency).upper()
         paid_by_id = data.get("paid_by", expense.paid_by_id)
 
         participant_ids = data.get("participant_ids")
@@ -469,56 +1304,67 @@ class ExpenseDetailView(APIView):
         if splits_data:
             participant_ids = [split["user_id"] for split in splits_data]
 
-        existing_participants = list(
-            ExpenseSplit.objects.filter(expense=expense).values_list("user_id", flat=True)
+        existing_splits = list(
+            ExpenseSplit.objects.filter(expense=expense).only(
+                "id", "user_id", "amount", "base_amount"
+            )
         )
-        members = TripMember.objects.filter(
-            trip=expense.trip,
-            status=TripStatus.ACTIVE,
-        ).select_related("user")
-
-        member_ids = {member.user_id for member in members}
-        if participant_ids:
-            missing = [pid for pid in participant_ids if pid not in member_ids]
-            if missing:
-                raise ValidationError("Participants must be trip members.")
-        else:
-            participant_ids = existing_participants or list(member_ids)
-
-        if paid_by_id not in member_ids:
-            raise ValidationError("paid_by must be a trip member.")
+        previous = {split.user_id: (split.amount, split.base_amount) for split in existing_splits}
+        resplit = (
+            bool(participant_ids)
+            or "split_type" in data
+            or amount != expense.amount
+            or not existing_splits
+        )
+        reprice = resplit or currency != expense.currency
+
+        member_ids = set()
+        if participant_ids or paid_by_id != expense.paid_by_id or not existing_splits:
+            member_ids = _active_member_ids(expense.trip_id)
+            if participant_ids:
+                missing = [pid for pid in participant_ids if pid not in member_ids]
+                if missing:
+                    raise ValidationError("Participants must be trip members.")
+            if paid_by_id not in member_ids:
+                raise ValidationError("paid_by must be a trip member.")
+        if not participant_ids:
+            participant_ids = list(previous) or list(member_ids)
 
         with transaction.atomic():
-            expense.title = title.strip()
+            deltas = expense_deltas(expense, existing_splits, sign=-1)
+            changed = [
+                field
+                for field, value in (
+                    ("title", title),
+                    ("category", data.get("category", expense.category)),
+                    ("amount", amount),
+                    ("currency", currency),
+                    ("paid_by_id", paid_by_id),
+                )
+                if getattr(expense, field) != value
+            ]
+            expense.title = title
+            expense.category = data.get("category", expense.category)
             expense.amount = amount
-            expense.currency = currency.upper() if currency else expense.currency
+            expense.currency = currency
             expense.paid_by_id = paid_by_id
-            expense.save(update_fields=["title", "amount", "currency", "paid_by"])
-
-            ExpenseSplit.objects.filter(expense=expense).delete()
-
-            if splits_data:
-                total_split = sum((split["amount"] for split in splits_data), Decimal("0"))
-                if total_split != amount:
-                    raise ValidationError("Split amounts must equal total amount.")
-                splits = [
-                    ExpenseSplit(expense=expense, user_id=split["user_id"], amount=split["amount"])
-                    for split in splits_data
-                ]
-            else:
-                count = len(participant_ids)
-                if count == 0:
-                    raise ValidationError("Participants required.")
-                quant = Decimal("0.01")
-                share = (amount / count).quantize(quant, rounding=ROUND_HALF_UP)
-                splits = []
-                for idx, user_id in enumerate(participant_ids):
-                    split_amount = share
-                    if idx == count - 1:
-                        split_amount = amount - share * (count - 1)
-                    splits.append(ExpenseSplit(expense=expense, user_id=user_id, amount=split_amount))
 
-            ExpenseSplit.objects.bulk_create(splits)
+            splits = existing_splits
+            if resplit:
+                split_type = data.get("split_type", SplitType.EQUAL)
+                splits = _build_splits(expense, split_type, splits_data, participant_ids)
+            if reprice:
+                previous_base = expense.base_amount
+                convert_expense(expense, splits, expense.trip.base_currency)
+                if expense.base_amount != previous_base:
+                    changed.append("base_amount")
+
+            splits_written = _write_split_changes(existing_splits, previous, splits)
+            if changed:
+                expense.save(update_fields=[field.removesuffix("_id") for field in changed])
+            elif splits_written:
+                record_changes(expense.trip_id, TripEntity.EXPENSE, [expense.id])
+            apply_deltas(expense.trip_id, expense_deltas(expense, splits, deltas=deltas))
 
         expense = (
             Expense.objects.filter(id=expense.id)
@@ -529,11 +1375,18 @@ class ExpenseDetailView(APIView):
         return Response(ExpenseSerializer(expense).data)
 
     def delete(self, request, expense_id):
-        expense = get_object_or_404(Expense, id=expense_id)
-        member = _require_member(request, expense.trip)
+        expense, member = _get_for_member(request, _locked_expenses(), id=expense_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
-        expense.delete()
+        with transaction.atomic():
+            splits = list(
+                ExpenseSplit.objects.filter(expense=expense).only(
+                    "user_id", "amount", "base_amount"
+                )
+            )
+            _, deleted = expense.delete()
+            if deleted.get(Expense._meta.label):
+                apply_deltas(expense.trip_id, expense_deltas(expense, splits, sign=-1))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -541,149 +1394,226 @@ class TripExpenseSummaryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
-
-        members = (
-            TripMember.objects.filter(trip=trip, status=TripStatus.ACTIVE)
-            .select_related("user")
-            .order_by("created_at")
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(
+            request, trip.id, [TripEntity.TRIP, TripEntity.EXPENSE, TripEntity.MEMBER]
         )
-        paid_map = {
-            row["paid_by_id"]: row["total"]
-            for row in Expense.objects.filter(trip=trip)
-            .values("paid_by_id")
-            .annotate(total=Sum("amount"))
-        }
-        owed_map = {
-            row["user_id"]: row["total"]
-            for row in ExpenseSplit.objects.filter(expense__trip=trip)
-            .values("user_id")
-            .annotate(total=Sum("amount"))
-        }
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        summary = _expense_summary(trip, _active_members(trip))
+        serializer = ExpenseSummarySerializer(summary, many=True)
+        return _with_etag(Response(serializer.data), etag)
 
-        summary = []
-        for member in members:
-            paid = paid_map.get(member.user_id, Decimal("0.00"))
-            owed = owed_map.get(member.user_id, Decimal("0.00"))
-            net = paid - owed
-            summary.append(
-                {
-                    "user": {
-                        "id": member.user_id,
-                        "email": member.user.email,
-                        "name": member.user.name or "",
-                    },
-                    "paid": paid,
-                    "owed": owed,
-                    "net": net,
-                }
-            )
 
-        serializer = ExpenseSummarySerializer(summary, many=True)
-        return Response(serializer.data)
+class TripExpenseSettlementsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, trip_id):
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(
+            request, trip.id, [TripEntity.TRIP, TripEntity.EXPENSE, TripEntity.MEMBER]
+        )
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        summary = _expense_summary(trip, _active_members(trip))
+        users = {row["user"]["id"]: row["user"] for row in summary}
+        transfers = settle({row["user"]["id"]: to_cents(row["net"]) for row in summary})
+        settlements = [
+            {
+                "from_user": users[debtor],
+                "to_user": users[creditor],
+                "amount": from_cents(cents),
+                "currency": trip.base_currency,
+            }
+            for debtor, creditor, cents in transfers
+        ]
+        serializer = SettlementSerializer(settlements, many=True)
+        return _with_etag(Response(serializer.data), etag)
 
 
-class TripItineraryView(APIView):
+class TripItineraryView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
-        items = ItineraryItem.objects.filter(trip=trip).order_by("sort_order")
-        serializer = ItineraryItemSerializer(items, many=True)
-        return Response(serializer.data)
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.ITINERARY])
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        fields = _parse_item_fields(request)
+        items = _windowed_itinerary(request, trip, fields)
+        if request.query_params.get("group") == "day":
+            serializer = ItineraryItemSerializer(fields=fields)
+            days = [
+                {
+                    "date": date.isoformat() if date else None,
+                    "items": [serializer.to_representation(item) for item in day],
+                }
+                for date, day in groupby(
+                    items.order_by(F("date").asc(nulls_last=True), "rank"),
+                    key=lambda item: item.date,
+                )
+            ]
+            return _with_etag(Response(days), etag)
+        if wants_stream(request):
+            return _with_etag(stream_queryset(items, ItineraryItemSerializer(fields=fields)), etag)
+        serializer = ItineraryItemSerializer(items, many=True, fields=fields)
+        return _with_etag(Response(serializer.data), etag)
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
         serializer = ItineraryItemSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        max_sort = (
-            ItineraryItem.objects.filter(trip=trip).aggregate(max_sort=Max("sort_order")).get("max_sort")
-            or -1
-        )
+        position = allocate_position(trip.id)
         item = serializer.save(
             trip=trip,
             created_by=request.user,
-            sort_order=max_sort + 1,
+            sort_order=position,
+            rank=rank_for_position(position),
         )
-        return Response(ItineraryItemSerializer(item).data, status=status.HTTP_201_CREATED)
+        data = ItineraryItemSerializer(item).data
+        if _wants_conflicts(request):
+            data["conflicts"] = _item_conflicts(item)
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
-class ItineraryItemDetailView(APIView):
+class TripItineraryConflictsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def _get_item(self, item_id, trip_id=None):
-        if trip_id is None:
-            return get_object_or_404(ItineraryItem, id=item_id)
-        return get_object_or_404(ItineraryItem, id=item_id, trip_id=trip_id)
+    def get(self, request, trip_id):
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.ITINERARY])
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        conflicts = [
+            {"date": date, "items": [first, second]}
+            for date, first, second in _itinerary_conflicts(trip)
+        ]
+        return _with_etag(Response({"conflicts": conflicts}), etag)
+
+
+class ItineraryItemDetailView(DeferredChangesMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _get_item(self, request, item_id, trip_id=None):
+        lookup = {"id": item_id}
+        if trip_id is not None:
+            lookup["trip_id"] = trip_id
+        return _get_for_member(request, ItineraryItem.objects.all(), **lookup)
 
     def patch(self, request, item_id, trip_id=None):
-        item = self._get_item(item_id, trip_id)
-        member = _require_member(request, item.trip)
+        item, member = self._get_item(request, item_id, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
         serializer = ItineraryItemSerializer(item, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data)
+        data = serializer.data
+        if _wants_conflicts(request):
+            data["conflicts"] = _item_conflicts(item)
+        return Response(data)
 
     def delete(self, request, item_id, trip_id=None):
-        item = self._get_item(item_id, trip_id)
-        member = _require_member(request, item.trip)
+        item, member = self._get_item(request, item_id, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
         item.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class TripItineraryReorderView(APIView):
+class ItineraryItemMoveView(DeferredChangesMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, trip_id, item_id):
+        trip, member = _get_trip_for_member(request, trip_id)
+        if not is_editor_or_owner(member):
+            raise PermissionDenied("Insufficient permissions.")
+
+        serializer = ItineraryMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        after = serializer.validated_data.get("after")
+        before = serializer.validated_data.get("before")
+        if item_id in (after, before):
+            raise ValidationError("An item cannot be moved next to itself.")
+
+        ranks = dict(
+            ItineraryItem.objects.filter(trip=trip, id__in=[item_id, after, before]).values_list(
+                "id", "rank"
+            )
+        )
+        if item_id not in ranks:
+            raise Http404
+        if (after and after not in ranks) or (before and before not in ranks):
+            raise ValidationError("All items must belong to the trip.")
+
+        # With one anchor, the other bound is that anchor's current neighbour.
+        others = (
+            ItineraryItem.objects.filter(trip=trip)
+            .exclude(id=item_id)
+            .values_list("rank", flat=True)
+        )
+        low = ranks[after] if after else None
+        high = ranks[before] if before else None
+        if before is None:
+            high = others.filter(rank__gt=low).order_by("rank").first()
+        elif after is None:
+            low = others.filter(rank__lt=high).order_by("-rank").first()
+        elif low >= high:
+            raise ValidationError("`after` must come before `before`.")
+
+        rank = key_between(low, high)
+        with transaction.atomic():
+            ItineraryItem.objects.filter(id=item_id).update(rank=rank, updated_at=timezone.now())
+            record_changes(trip.id, TripEntity.ITINERARY, [item_id])
+        if len(rank) > REBALANCE_LENGTH:
+            rebalance_ranks(trip.id)
+            rank = ItineraryItem.objects.values_list("rank", flat=True).get(id=item_id)
+        return Response({"id": item_id, "rank": rank})
+
+
+class TripItineraryReorderView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
         serializer = ItineraryReorderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         items = serializer.validated_data["items"]
-        ids = [item["id"] for item in items]
+        positions = {item["id"]: item["sort_order"] for item in items}
+        if len(positions) != len(items):
+            raise ValidationError("Each item may only be listed once.")
 
-        queryset = ItineraryItem.objects.filter(trip=trip, id__in=ids)
-        if queryset.count() != len(ids):
-            raise ValidationError("All items must belong to the trip.")
-
-        sort_map = {item["id"]: item["sort_order"] for item in items}
         with transaction.atomic():
-            for item in queryset:
-                item.sort_order = sort_map[item.id]
-            ItineraryItem.objects.bulk_update(queryset, ["sort_order", "updated_at"])
+            # The UPDATE is scoped to the trip, so a short row count means a foreign id.
+            if write_positions(trip.id, positions) != len(positions):
+                raise ValidationError("All items must belong to the trip.")
+            if positions:
+                reserve_positions(trip.id, max(positions.values()))
+            record_changes(trip.id, TripEntity.ITINERARY, list(positions))
 
-        ordered = ItineraryItem.objects.filter(trip=trip).order_by("sort_order")
-        return Response(ItineraryItemSerializer(ordered, many=True).data)
+        if request.query_params.get("full") in ("1", "true"):
+            return Response(ItineraryItemSerializer(_itinerary_items(trip), many=True).data)
+        return Response({str(item_id): position for item_id, position in positions.items()})
 
 
-class TripInvitesView(APIView):
+class TripInvitesView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_owner(member):
             raise PermissionDenied("Only owners can view invites.")
         invites = TripInvite.objects.filter(trip=trip).order_by("-created_at")
         return Response(TripInviteSerializer(invites, many=True).data)
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_owner(member):
             raise PermissionDenied("Only owners can invite.")
 
@@ -737,7 +1667,7 @@ class TripInvitesView(APIView):
         return Response(TripInviteSerializer(invite).data, status=status.HTTP_201_CREATED)
 
 
-class InviteAcceptView(APIView):
+class InviteAcceptView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -762,16 +1692,17 @@ class InviteAcceptView(APIView):
             raise PermissionDenied("Invite email does not match your account.")
 
         member, _ = TripMember.objects.get_or_create(
-            trip=invite.trip,
+            trip_id=invite.trip_id,
             user=request.user,
             defaults={"role": invite.role, "status": TripStatus.ACTIVE},
         )
+        invalidate_trip_member(request.user.id, invite.trip_id)
         invite.status = InviteStatus.ACCEPTED
         invite.save(update_fields=["status"])
         return Response(TripMemberSerializer(member).data)
 
 
-class InviteAcceptByIdView(APIView):
+class InviteAcceptByIdView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -791,23 +1722,25 @@ class InviteAcceptByIdView(APIView):
             raise PermissionDenied("Invite email does not match your account.")
 
         TripMember.objects.get_or_create(
-            trip=invite.trip,
+            trip_id=invite.trip_id,
             user=request.user,
             defaults={"role": invite.role, "status": TripStatus.ACTIVE},
         )
+        invalidate_trip_member(request.user.id, invite.trip_id)
         invite.status = InviteStatus.ACCEPTED
         invite.save(update_fields=["status"])
         return Response(TripInviteSentSerializer(invite).data)
 
 
-class InviteRevokeView(APIView):
+class InviteRevokeView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
         serializer = InviteRevokeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        invite = get_object_or_404(TripInvite, id=serializer.validated_data["invite_id"])
-        member = _require_member(request, invite.trip)
+        invite, member = _get_for_member(
+            request, TripInvite.objects.all(), id=serializer.validated_data["invite_id"]
+        )
         if not is_owner(member):
             raise PermissionDenied("Only owners can revoke invites.")
         if invite.status != InviteStatus.PENDING:
@@ -817,7 +1750,7 @@ class InviteRevokeView(APIView):
         return Response(TripInviteSerializer(invite).data)
 
 
-class InviteDeclineView(APIView):
+class InviteDeclineView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -850,9 +1783,18 @@ class SentInvitesView(APIView):
             .select_related("trip")
             .order_by("-created_at")
         )
+        if wants_stream(request):
+            return stream_queryset(invites, TripInviteSentSerializer())
         return Response(TripInviteSentSerializer(invites, many=True).data)
 
 
+class MyBalancesView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(MyBalancesSerializer(_my_balances(request.user)).data)
+
+
 class ReceivedInvitesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -862,41 +1804,34 @@ class ReceivedInvitesView(APIView):
             .select_related("trip")
             .order_by("-created_at")
         )
+        if wants_stream(request):
+            return stream_queryset(invites, TripInviteSentSerializer())
         return Response(TripInviteSentSerializer(invites, many=True).data)
 
 
-class TripPollsView(APIView):
+class TripPollsView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        _require_member(request, trip)
-        options_qs = PollOption.objects.annotate(vote_count=Count("votes"))
-        polls = (
-            Poll.objects.filter(trip=trip)
-            .prefetch_related(
-                Prefetch("options", queryset=options_qs),
-                Prefetch(
-                    "votes",
-                    queryset=Vote.objects.filter(user=request.user),
-                    to_attr="user_votes",
-                ),
-            )
-            .order_by("-created_at")
-        )
+        trip, _ = _get_trip_for_member(request, trip_id)
+        etag = collection_etag(request, trip.id, [TripEntity.POLL], per_user=True)
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        polls = _polls_for_user(trip, request.user)
         serializer = PollSerializer(polls, many=True, context={"request": request})
-        return Response(serializer.data)
+        return _with_etag(Response(serializer.data), etag)
 
     def post(self, request, trip_id):
-        trip = _get_trip_or_404(trip_id)
-        member = _require_member(request, trip)
+        trip, member = _get_trip_for_member(request, trip_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
         serializer = PollCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         question = serializer.validated_data["question"]
-        options = [option.strip() for option in serializer.validated_data["options"] if option.strip()]
+        options = [
+            option.strip() for option in serializer.validated_data["options"] if option.strip()
+        ]
         if len(options) < 2:
             raise ValidationError("At least two options are required.")
 
@@ -912,33 +1847,29 @@ class TripPollsView(APIView):
             .prefetch_related(Prefetch("options", queryset=options_qs))
             .first()
         )
-        return Response(PollSerializer(poll, context={"request": request}).data, status=status.HTTP_201_CREATED)
+        return Response(
+            PollSerializer(poll, context={"request": request}).data, status=status.HTTP_201_CREATED
+        )
 
 
-class PollDetailView(APIView):
+class PollDetailView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, poll_id):
-        poll = get_object_or_404(Poll, id=poll_id)
-        _require_member(request, poll.trip)
         options_qs = PollOption.objects.annotate(vote_count=Count("votes"))
-        poll = (
-            Poll.objects.filter(id=poll_id)
-            .prefetch_related(
-                Prefetch("options", queryset=options_qs),
-                Prefetch(
-                    "votes",
-                    queryset=Vote.objects.filter(user=request.user),
-                    to_attr="user_votes",
-                ),
-            )
-            .first()
+        queryset = Poll.objects.prefetch_related(
+            Prefetch("options", queryset=options_qs),
+            Prefetch(
+                "votes",
+                queryset=Vote.objects.filter(user=request.user),
+                to_attr="user_votes",
+            ),
         )
+        poll, _ = _get_for_member(request, queryset, id=poll_id)
         return Response(PollSerializer(poll, context={"request": request}).data)
 
     def patch(self, request, poll_id):
-        poll = get_object_or_404(Poll, id=poll_id)
-        member = _require_member(request, poll.trip)
+        poll, member = _get_for_member(request, Poll.objects.all(), id=poll_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
 
@@ -983,20 +1914,18 @@ class PollDetailView(APIView):
         return Response(PollSerializer(poll, context={"request": request}).data)
 
     def delete(self, request, poll_id):
-        poll = get_object_or_404(Poll, id=poll_id)
-        member = _require_member(request, poll.trip)
+        poll, member = _get_for_member(request, Poll.objects.all(), id=poll_id)
         if not is_editor_or_owner(member):
             raise PermissionDenied("Insufficient permissions.")
         poll.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class PollVoteView(APIView):
+class PollVoteView(DeferredChangesMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, poll_id):
-        poll = get_object_or_404(Poll, id=poll_id)
-        _require_member(request, poll.trip)
+        poll, _ = _get_for_member(request, Poll.objects.all(), id=poll_id)
         if not poll.is_active:
             raise ValidationError("Poll is closed.")
 
@@ -1004,11 +1933,13 @@ class PollVoteView(APIView):
         serializer.is_valid(raise_exception=True)
         option = get_object_or_404(PollOption, id=serializer.validated_data["option_id"], poll=poll)
 
-        Vote.objects.update_or_create(
-            poll=poll,
-            user=request.user,
-            defaults={"option": option},
-        )
+        with transaction.atomic():
+            Vote.objects.update_or_create(
+                poll=poll,
+                user=request.user,
+                defaults={"option": option},
+            )
+            record_changes(poll.trip_id, TripEntity.POLL, [poll.id])
 
         options_qs = PollOption.objects.annotate(vote_count=Count("votes"))
         poll = (
@@ -1,7 +1,7 @@
+from datetime import timedelta
 from pathlib import Path
 
 import environ
-from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 
@@ -25,6 +25,8 @@ env = environ.Env(
     DEFAULT_FROM_EMAIL=(str, "no-reply@smart-trip-planner.local"),
     INVITE_EMAIL_SUBJECT=(str, "You're invited to a trip"),
     REDIS_URL=(str, ""),
+    TRIP_MEMBERSHIP_CACHE_TIMEOUT=(int, 300),
+    FX_RATES_CACHE_TIMEOUT=(int, 300),
 )
 
 environ.Env.read_env(BASE_DIR / ".env")
@@ -95,6 +97,7 @@ DATABASES = {
         default="postgres://smart_trip_planner:smart_trip_planner@db:5432/smart_trip_planner",
     )
 }
+DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -161,6 +164,9 @@ CACHES = {
     }
 }
 
+TRIP_MEMBERSHIP_CACHE_TIMEOUT = env.int("TRIP_MEMBERSHIP_CACHE_TIMEOUT")
+FX_RATES_CACHE_TIMEOUT = env.int("FX_RATES_CACHE_TIMEOUT")
+
 RATE_LIMIT_ANON_PER_MINUTE = env.int("RATE_LIMIT_ANON_PER_MINUTE")
 RATE_LIMIT_USER_PER_MINUTE = env.int("RATE_LIMIT_USER_PER_MINUTE")
 
@@ -177,6 +183,11 @@ DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL")
 
 REDIS_URL = env("REDIS_URL")
 if REDIS_URL:
+    # Shared by every worker process, so a membership change is seen by all of them at once.
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
     CHANNEL_LAYERS = {
         "default": {
             "BACKEND": "channels_redis.core.RedisChannelLayer",
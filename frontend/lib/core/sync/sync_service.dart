@@ -80,7 +80,7 @@ class SyncService {
     final data = Map<String, dynamic>.from(payload['data'] as Map);
     final item = await itineraryRemote.createItem(tripId: tripId, payload: data);
     await itineraryLocal.deleteItem(tempId);
-    await itineraryLocal.upsertItem(item);
+    await itineraryLocal.upsertRemoteItem(item);
   }
 
   Future<void> _handleUpdateItinerary(PendingAction action) async {
@@ -93,7 +93,7 @@ class SyncService {
       tripId: tripId,
       payload: data,
     );
-    await itineraryLocal.upsertItem(item);
+    await itineraryLocal.upsertRemoteItem(item);
   }
 
   Future<void> _handleDeleteItinerary(PendingAction action) async {
@@ -27,6 +27,17 @@ class ItineraryLocalDataSource {
     await box.put(item.id, item);
   }
 
+  // Stores an item returned by the API, which carries no position of its own.
+  // A known item keeps its place; a new one goes after the trip's other items.
+  Future<ItineraryItemModel> upsertRemoteItem(ItineraryItemModel item) async {
+    final cached = box.get(item.id);
+    final sortOrder = cached?.sortOrder ??
+        box.values.where((other) => other.tripId == item.tripId).length;
+    final positioned = item.copyWith(sortOrder: sortOrder);
+    await box.put(positioned.id, positioned);
+    return positioned;
+  }
+
   Future<void> deleteItem(String id) async {
     await box.delete(id);
   }
@@ -9,15 +9,7 @@ class ItineraryRemoteDataSource {
 
   Future<List<ItineraryItemModel>> fetchItems(String tripId) async {
     final response = await dio.get('/api/trips/$tripId/itinerary');
-    final data = response.data as List;
-    return data
-        .map(
-          (item) => ItineraryItemModel.fromJson(
-            item as Map<String, dynamic>,
-            tripId: tripId,
-          ),
-        )
-        .toList();
+    return _inServerOrder(response.data as List, tripId);
   }
 
   Future<ItineraryItemModel> createItem({
@@ -49,16 +41,26 @@ class ItineraryRemoteDataSource {
     required String tripId,
     required List<Map<String, dynamic>> items,
   }) async {
+    // The default reply is only {id: sort_order}; full=1 returns the reordered items.
     final response = await dio.post(
       '/api/trips/$tripId/itinerary/reorder',
+      queryParameters: {'full': 1},
       data: {'items': items},
     );
-    final data = response.data as List;
+    return _inServerOrder(response.data as List, tripId);
+  }
+
+  // Items no longer carry sort_order; lists arrive in rank order, so the
+  // position in the reply is the item's place in the itinerary.
+  List<ItineraryItemModel> _inServerOrder(List data, String tripId) {
     return data
+        .asMap()
+        .entries
         .map(
-          (item) => ItineraryItemModel.fromJson(
-            item as Map<String, dynamic>,
+          (entry) => ItineraryItemModel.fromJson(
+            entry.value as Map<String, dynamic>,
             tripId: tripId,
+            sortOrder: entry.key,
           ),
         )
         .toList();
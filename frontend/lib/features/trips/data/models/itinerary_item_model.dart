@@ -22,6 +22,7 @@ class ItineraryItemModel extends ItineraryItemEntity {
   factory ItineraryItemModel.fromJson(
     Map<String, dynamic> json, {
     required String tripId,
+    int? sortOrder,
   }) {
     return ItineraryItemModel(
       id: json['id'] as String,
@@ -32,7 +33,7 @@ class ItineraryItemModel extends ItineraryItemEntity {
       startTime: json['start_time'] as String?,
       endTime: json['end_time'] as String?,
       date: json['date'] != null ? DateTime.parse(json['date']) : null,
-      sortOrder: json['sort_order'] as int? ?? 0,
+      sortOrder: sortOrder ?? json['sort_order'] as int? ?? 0,
       createdBy: json['created_by'] as String?,
       createdAt: json['created_at'] != null ? DateTime.parse(json['created_at']) : null,
       updatedAt: json['updated_at'] != null ? DateTime.parse(json['updated_at']) : null,
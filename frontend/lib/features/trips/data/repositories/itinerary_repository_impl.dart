@@ -53,8 +53,7 @@ class ItineraryRepositoryImpl implements ItineraryRepository {
           'date': date?.toIso8601String().split('T').first,
         },
       );
-      await localDataSource.upsertItem(item);
-      return item;
+      return localDataSource.upsertRemoteItem(item);
     } catch (error) {
       throw mapDioError(error);
     }
@@ -85,8 +84,7 @@ class ItineraryRepositoryImpl implements ItineraryRepository {
         tripId: tripId,
         payload: payload,
       );
-      await localDataSource.upsertItem(item);
-      return item;
+      return localDataSource.upsertRemoteItem(item);
     } catch (error) {
       throw mapDioError(error);
     }